@@ -0,0 +1,294 @@
+"""
+Batch analysis of PGN games for post-game review.
+
+Games are streamed from the PGN files one at a time and every position
+after a move is sent to a pool of engine processes, each with its own
+Search and transposition table. Only a bounded window of games is in
+flight, and finished games are written in their input order, so memory
+stays flat however large the archive. Each game is written out as soon
+as its positions are analysed: to an annotated PGN, with a
+{[%eval ...]} comment after every move, and optionally to a JSON lines
+file. A checkpoint records how many games are done and how long the
+outputs were at that point, so an interrupted run continues with
+--resume where it stopped.
+
+Run `python analyse.py games.pgn -o analysed.pgn` to analyse a file.
+
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from rules.bitboard import WHITE, move_uci
+from rules.fen import parse_fen, to_fen
+from rules.pgn import read_games, write_game
+from rules.san import move_to_san
+from engine.evaluate import MATE, MAX_PLY, MATE_BOUND
+from engine.search import Search
+from engine.tt import TranspositionTable
+
+# Seconds between two progress lines
+PROGRESS_INTERVAL = 5.0
+
+# The search of one engine process, created by _start_worker
+_search = None
+
+
+def _start_worker(hash_mb):
+    """
+    Pool initializer: create the search this process uses for all its positions.
+
+    """
+    global _search
+    _search = Search(TranspositionTable(hash_mb))
+
+
+def _analyse_position(fen, history, time_limit, max_depth):
+    """
+    Search one position in an engine process; history holds the hashes of
+    the game's earlier positions, so repetitions are scored as draws.
+
+    Returns:
+    - tuple: (score, depth, nodes, move), the score in centipawns for the
+      side to move and the move in UCI notation.
+
+    """
+    pos = parse_fen(fen)
+    pos.history = history
+    move = _search.search(pos, time_limit, max_depth)
+    return _search.score, _search.depth, _search.nodes, move_uci(move) if move is not None else None
+
+
+def format_eval(score):
+    """
+    Return a score from white's point of view as a PGN %eval value, e.g. '0.35' or '#-3'.
+
+    """
+    if abs(score) >= MATE_BOUND:
+        moves = (MATE - abs(score) + 1) // 2
+        return '#%d' % (moves if score > 0 else -moves)
+    return '%.2f' % (score / 100)
+
+
+class Checkpoint:
+    """
+    Checkpoint class records the progress of a run in a small JSON file.
+
+    The file is replaced atomically, so it always describes games that are
+    completely written; the output lengths let a resumed run cut off a
+    game that was only partly written when the run stopped.
+
+    Attributes:
+    - path (str): File the checkpoint is kept in.
+    - games_done (int): Games read from the input, analysed or not.
+    - positions (int): Positions analysed.
+    - offsets (dict): Length in bytes of every output file after the last game.
+
+    Methods:
+    - load(): Read the checkpoint file, if it exists.
+    - save(): Write the checkpoint file atomically.
+
+    """
+
+    def __init__(self, path):
+        """
+        Initialize an empty checkpoint.
+
+        """
+        self.path = path
+        self.games_done = 0
+        self.positions = 0
+        self.offsets = {}
+
+    def load(self):
+        """
+        Read the checkpoint file, if it exists.
+
+        Returns:
+        - bool: True if a checkpoint was read.
+
+        """
+        if not os.path.exists(self.path):
+            return False
+        with open(self.path, encoding='utf-8') as stream:
+            data = json.load(stream)
+        self.games_done = data['games_done']
+        self.positions = data['positions']
+        self.offsets = data['offsets']
+        return True
+
+    def save(self):
+        """
+        Write the checkpoint to a temporary file and move it into place.
+
+        """
+        temporary = self.path + '.tmp'
+        with open(temporary, 'w', encoding='utf-8') as stream:
+            json.dump({'games_done': self.games_done, 'positions': self.positions, 'offsets': self.offsets}, stream)
+            stream.flush()
+            os.fsync(stream.fileno())
+        os.replace(temporary, self.path)
+
+
+def _open_output(path, checkpoint, resume):
+    """
+    Open an output file: truncated for a new run, cut back to the checkpointed length when resuming.
+
+    """
+    if not resume:
+        return open(path, 'w', encoding='utf-8')
+    out = open(path, 'a', encoding='utf-8')
+    out.truncate(checkpoint.offsets.get(path, 0))
+    return out
+
+
+def iter_games(paths):
+    """
+    Yield every game of several PGN files in order.
+
+    """
+    for path in paths:
+        with open(path, encoding='utf-8', errors='replace') as stream:
+            yield from read_games(stream)
+
+
+def submit_game(executor, game, time_limit, max_depth):
+    """
+    Send every position after a move of a game to the pool.
+
+    Returns:
+    - list: (san, white_to_move, future) per move; the future is None when
+      the game is over after the move, as there is nothing to search. The
+      list is empty when the game's FEN tag is invalid, which read_games
+      has already recorded in its error attribute.
+
+    """
+    try:
+        pos = game.starting_position()
+    except ValueError:
+        return []
+    plies = []
+    for move in game.moves:
+        san = move_to_san(pos, move)
+        pos.make_move(move)
+        future = None
+        if pos.legal_moves():
+            # Positions before the last capture or pawn move cannot repeat
+            history = pos.history[-pos.halfmove_clock:] if pos.halfmove_clock else []
+            future = executor.submit(_analyse_position, to_fen(pos), history, time_limit, max_depth)
+        plies.append((san, pos.turn == WHITE, future))
+    return plies
+
+
+def finish_game(index, game, plies, pgn_out, json_out):
+    """
+    Wait for the analysis of a game and write it to the outputs.
+
+    Returns:
+    - int: Positions analysed.
+
+    """
+    comments = []
+    records = []
+    for san, white_to_move, future in plies:
+        record = {'san': san, 'eval': None, 'depth': None, 'nodes': None, 'best': None}
+        comment = None
+        if future is not None:
+            score, depth, nodes, best = future.result()
+            score = score if white_to_move else -score
+            comment = '[%%eval %s]' % format_eval(score)
+            record.update(eval=format_eval(score), depth=depth, nodes=nodes, best=best)
+        comments.append(comment)
+        records.append(record)
+    write_game(pgn_out, game, comments=comments)
+    pgn_out.flush()
+    if json_out is not None:
+        json_out.write(json.dumps({'game': index, 'headers': game.headers, 'result': game.result,
+                                   'error': game.error, 'moves': records}) + '\n')
+        json_out.flush()
+    return sum(future is not None for _, _, future in plies)
+
+
+def main(argv=None):
+    """
+    Command-line entry point.
+
+    """
+    parser = argparse.ArgumentParser(description="Analyse every position of PGN games with a pool of engine processes.")
+    parser.add_argument('files', nargs='+', help="PGN files to analyse")
+    parser.add_argument('-o', '--output', required=True, help="annotated PGN file to write")
+    parser.add_argument('--json', help="also write one JSON object per game to this file")
+    parser.add_argument('-t', '--time', type=float, default=0.2, help="seconds per position (default 0.2)")
+    parser.add_argument('-d', '--depth', type=int, default=MAX_PLY, help="deepest iteration per position")
+    parser.add_argument('-j', '--jobs', type=int, default=multiprocessing.cpu_count(),
+                        help="engine processes (default the number of CPUs)")
+    parser.add_argument('--hash', type=float, default=16, help="transposition table size per process in MB (default 16)")
+    parser.add_argument('--window', type=int, default=0,
+                        help="games in flight at once (default twice the number of processes)")
+    parser.add_argument('--checkpoint', help="checkpoint file (default the output file with .checkpoint added)")
+    parser.add_argument('--resume', action='store_true', help="skip the games a previous run finished and append to its output")
+    args = parser.parse_args(argv)
+
+    jobs = max(1, args.jobs)
+    window = args.window if args.window > 0 else 2 * jobs
+    checkpoint = Checkpoint(args.checkpoint or args.output + '.checkpoint')
+    resume = args.resume and checkpoint.load()
+    if resume:
+        print('resuming after %d games' % checkpoint.games_done)
+
+    pgn_out = _open_output(args.output, checkpoint, resume)
+    json_out = _open_output(args.json, checkpoint, resume) if args.json else None
+    outputs = [out for out in (pgn_out, json_out) if out is not None]
+    skipped = checkpoint.games_done
+    positions = 0
+    start = last_report = time.perf_counter()
+    pending = deque()
+
+    def report():
+        elapsed = time.perf_counter() - start
+        rate = positions / elapsed if elapsed > 0 else 0.0
+        print('games %d  positions %d  time %.1fs  positions/s %.1f' % (
+            checkpoint.games_done, checkpoint.positions, elapsed, rate))
+
+    def flush_oldest():
+        nonlocal positions
+        index, game, plies = pending.popleft()
+        done = finish_game(index, game, plies, pgn_out, json_out)
+        positions += done
+        checkpoint.games_done = index + 1
+        checkpoint.positions += done
+        checkpoint.offsets = {out.name: out.tell() for out in outputs}
+        checkpoint.save()
+
+    executor = ProcessPoolExecutor(jobs, initializer=_start_worker, initargs=(args.hash,))
+    try:
+        for index, game in enumerate(iter_games(args.files)):
+            if index < skipped:
+                continue
+            pending.append((index, game, submit_game(executor, game, args.time, args.depth)))
+            while len(pending) >= window:
+                flush_oldest()
+                if time.perf_counter() - last_report >= PROGRESS_INTERVAL:
+                    report()
+                    last_report = time.perf_counter()
+        while pending:
+            flush_oldest()
+    except KeyboardInterrupt:
+        print('interrupted; run again with --resume to continue')
+        executor.shutdown(wait=False, cancel_futures=True)
+        return 1
+    finally:
+        for out in outputs:
+            out.close()
+    executor.shutdown()
+    report()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,39 +1,99 @@
-from PyQt5.QtCore import  Qt
+from PyQt5.QtCore import  Qt, QTimer
+from PyQt5.QtGui import QColor
 from PyQt5.QtWidgets import QGraphicsScene, QGraphicsView, QApplication
-from pawns.pawn import Pawn 
+from pawns.pawn import Pawn, promote_pawn
 from pawns.queen import Queen 
 from pawns.rook import Rook 
 from pawns.bishop import Bishop 
 from pawns.knight import Knight 
 from pawns.king import King
-from pawns.square import Square
+from pawns.square import Highlight
+from pawns.pixmaps import board_pixmap
+from rules.bitboard import WHITE, BLACK, PAWN, COLOR_NAMES, square, square_file, square_rank, move_from, move_to, move_promotion, move_uci
+from rules.position import Position
+from rules.fen import parse_fen, to_fen
+from rules.pgn import start_game, write_game, game_result
+from rules.san import parse_notation
+from engine.search import allot_time, format_score
+from engine.worker import AnalysisWorker
 from resource import *
 
+# Piece classes and images indexed by the rules core's piece types
+PIECE_CLASSES = (Pawn, Knight, Bishop, Rook, Queen, King)
+PIECE_IMAGES = ((':/wp.png', ':/wn.png', ':/wb.png', ':/wr.png', ':/wq.png', ':/wk.png'),
+                (':/bp.png', ':/bn.png', ':/bb.png', ':/br.png', ':/bq.png', ':/bk.png'))
 
 
 class ChessBoard(QGraphicsScene):
     """
     ChessBoard class represents the main game board.
 
+    The rules are evaluated by a headless Position (rules/position.py); the
+    scene items mirror it and are updated only when a move is played.
+    Square (col, row) on the scene is square (7 - col, row) of the position,
+    so white starts on the top rows.
+
     Attributes:
     - b_view (int): Board view option.
     - square_size (int): Size of each square on the chessboard.
+    - position (Position): Rules model of the current position.
+    - occupancy (list): 8x8 array of piece items indexed [row][col], None for an empty square.
+    - colors (list): Light and dark square colours of each board view.
+    - background (QPixmap): Cached image of the empty board, drawn by drawBackground.
+    - highlight (Highlight): Item marking the squares the selected piece may move to.
+    - moves (dict): Cached legal moves of the side to move, keyed by origin square.
+    - moves_key (int): Hash of the position the cached moves were generated for.
     - current_turn (str): Current turn ('white' or 'black').
     - checkwhite (bool): True if white king is in check.
     - checkblack (bool): True if black king is in check.
-    - kingwpos (list): Position of the white king.
-    - kingbpos (list): Position of the black king.
-    - buffkingwpos (list): Buffer for white king position.
-    - buffkingbpos (list): Buffer for black king position.
-    - timer1_id (int): Timer ID for white player turn.
-    - timer2_id (int): Timer ID for black player turn.
+    - engine_color (int): Colour played by the computer, or None for human-vs-human.
+    - engine_time (float): Seconds the computer may think per move, less when its clock is short.
+    - analysing (bool): True to analyse the position continuously while the player thinks.
+    - analysis (dict): Latest 'info' message of the engine for the current position, or None.
+    - worker (AnalysisWorker): Engine running in a separate process.
+    - worker_timer (QTimer): Polls the worker for results while it is searching.
+    - game (Game): Record of the moves played since the position was set up.
+    - history (list): Undo records of the moves in game, the last move last.
+    - redo_moves (list): Moves taken back, the next one to redo last.
+    - clock (GameClock): Clocks of the game, switched on every turn change, or None.
 
     Methods:
     - check_white(): Check if the white king is in check.
     - check_black(): Check if the black king is in check.
-    - timerEvent(event): Handle timer events for player turns.
+    - update_check(): Refresh the check flags after a move.
+    - hash: Zobrist hash of the current position.
     - init_board(): Initialize the chessboard with pieces and squares.
-    - update_board(x, y, fig): Update the board after a move.
+    - set_board_color(light, dark): Change the colours of the board squares.
+    - drawBackground(painter, rect): Paint the cached board image.
+    - load_fen(fen): Set up the position of a FEN string on the board.
+    - to_fen(): Return the current position as a FEN string.
+    - save_pgn(path): Append the game played so far to a PGN file.
+    - square_at(x, y): Return the position square under scene coordinates.
+    - square_pos(sq): Return the scene coordinates of a position square.
+    - addItem(item): Add an item to the scene and the occupancy array.
+    - removeItem(item): Remove an item from the scene and the occupancy array.
+    - item_at_square(sq): Return the piece item standing on a square.
+    - place_item(item, sq): Move a piece item to a square.
+    - legal_moves(): Return the cached legal moves of the side to move.
+    - game_end(): Return how the game ended, or None while it goes on.
+    - possible_squares(item): Return the squares a piece item may move to.
+    - show_moves(item): Highlight the squares a piece item may move to.
+    - hide_moves(): Remove the move highlights.
+    - add_piece(color, piece_type, sq): Create a piece item on a square.
+    - remove_piece(item): Take a piece item off the board.
+    - is_valid_move(item, x, y): Check if a piece item may move to the given coordinates.
+    - find_moves(item, x, y): Return the legal moves of a piece item to the given coordinates.
+    - make_move(item, x, y, promotion): Move a piece item if the move is legal.
+    - play(move): Play a legal move on the position and the scene.
+    - undo_move(): Take back the player's last move.
+    - redo_move(): Play again the move last taken back.
+    - play_notation(text): Play a move written in algebraic notation.
+    - time_forfeit(color): End the game when a side's time runs out.
+    - engine_move_time(): Return the seconds the computer may think on this move.
+    - start_engine_turn(): Start the engine on the position after a move.
+    - set_analysing(enabled): Switch continuous analysis on or off.
+    - poll_worker(): Handle the results the engine has sent.
+    - close_worker(): Stop the engine process.
 
     """
 
@@ -42,7 +102,6 @@ class ChessBoard(QGraphicsScene):
         Initialize the ChessBoard.
 
         - Sets up initial game state.
-        - Initializes timers for player turns.
 
         """
         super().__init__()
@@ -51,13 +110,23 @@ class ChessBoard(QGraphicsScene):
         self.current_turn = 'white'
         self.checkwhite = False
         self.checkblack = False
-        self.kingwpos = [3*self.square_size, 0*self.square_size]
-        self.kingbpos = [4*self.square_size, 7*self.square_size]
-        self.buffkingwpos = [3*self.square_size, 0*self.square_size]
-        self.buffkingbpos = [4*self.square_size, 7*self.square_size]
+        self.position = Position.initial()
+        self.occupancy = [[None] * 8 for _ in range(8)]
+        self.engine_color = None
+        self.engine_time = 1.0
+        self.analysing = False
+        self.analysis = None
+        self.worker = AnalysisWorker()
+        self.worker_timer = QTimer()
+        self.worker_timer.setInterval(50)
+        self.worker_timer.timeout.connect(self.poll_worker)
+        self.game = start_game()
+        self.history = []
+        self.redo_moves = []
+        self.clock = None
+        self.moves_key = None
+        self.moves = {}
         self.init_board()
-        self.timer1_id = self.startTimer(1000)
-        self.timer2_id = self.startTimer(1000) 
 
     def check_white(self):
         """
@@ -67,12 +136,10 @@ class ChessBoard(QGraphicsScene):
         - bool: True if white king is in check.
 
         """
-        for item in self.items():
-            if not isinstance(item, Square) and item.color == 'black':
-                if item.is_valid_move2(self.kingwpos[0],self.kingwpos[1]):
-                    self.checkwhite = True
-                    print("CHECK White")
-                    return True
+        if self.position.in_check(WHITE):
+            self.checkwhite = True
+            print("CHECK White")
+            return True
         self.checkwhite = False
         return False
 
@@ -84,110 +151,606 @@ class ChessBoard(QGraphicsScene):
         - bool: True if black king is in check.
 
         """
-        for item in self.items():
-            if not isinstance(item, Square) and item.color == 'white':
-                if item.is_valid_move2(self.kingbpos[0],self.kingbpos[1]):
-                    self.checkblack = True
-                    print("CHECK Black")
-                    return True
-        self.checkblack = True
+        if self.position.in_check(BLACK):
+            self.checkblack = True
+            print("CHECK Black")
+            return True
+        self.checkblack = False
         return False
-    
-    def timerEvent(self, event):
+
+    def update_check(self):
         """
-        Handle timer events for player turns.
+        Refresh the check flags after a move.
 
-        Parameters:
-        - event (QTimerEvent): Timer event triggering the function.
+        Only the side to move can be in check, and the position already
+        knows its checkers from the squares the move touched, so nothing is
+        evaluated while the board is idle.
 
         """
-        if event.timerId() == self.timer1_id:
+        self.checkwhite = False
+        self.checkblack = False
+        if self.position.turn == WHITE:
             self.check_white()
-        elif event.timerId() == self.timer2_id:
+        else:
             self.check_black()
-        
 
-                
+    @property
+    def hash(self):
+        """
+        Zobrist hash of the current position, for keying caches of per-position data.
+
+        """
+        return self.position.hash
 
     def init_board(self):
         """
-        Initialize the chessboard with pieces and squares.
+        Initialize the chessboard with squares and the pieces of the position.
 
         """
         self.colors = [[Qt.white, Qt.lightGray],
                        [Qt.yellow, Qt.darkYellow],
                        [Qt.blue, Qt.darkBlue]]
-        for row in range(8):
-            for col in range(8):
-                x = col * self.square_size
-                y = row * self.square_size
-                color = self.colors[self.b_view - 1][(row + col) % 2]
-                pos = (row + col) % 2
-                square = Square(x, y, self.square_size, color, pos)
-                self.addItem(square)
-
-
-        wp = ':/wp.png'; bp=':/bp.png'; wr = ':/wr.png'; br = ':/br.png'; wn = ':/wn.png'; bn = ':/bn.png'; wb = ':/wb.png'; bb = ':/bb.png'; wk = ':/wk.png'; bk = ':/bk.png'; wq = ':/wq.png'; bq = ':/bq.png'
-
-
-        for p in range(8):
-            pawn = Pawn(p*self.square_size, 1*self.square_size, self.square_size, 'white', wp)
-            self.addItem(pawn)
-        for p in range(8):
-            pawn = Pawn(p*self.square_size, 6*self.square_size, self.square_size, 'black', bp)
-            self.addItem(pawn)
-
-        rook1w = Rook(0*self.square_size, 0*self.square_size, self.square_size, 'white', wr)
-        rook2w = Rook(7*self.square_size, 0*self.square_size, self.square_size, 'white', wr)
-        self.addItem(rook1w)
-        self.addItem(rook2w)
-        rook1b = Rook(0*self.square_size, 7*self.square_size, self.square_size, 'black', br)
-        rook2b = Rook(7*self.square_size, 7*self.square_size, self.square_size, 'black', br)
-        self.addItem(rook1b)
-        self.addItem(rook2b)
-
-        knight1w = Knight(1*self.square_size, 0*self.square_size, self.square_size, 'white', wn)
-        knight2w = Knight(6*self.square_size, 0*self.square_size, self.square_size, 'white', wn)
-        self.addItem(knight1w)
-        self.addItem(knight2w)
-        knight1b = Knight(1*self.square_size, 7*self.square_size, self.square_size, 'black', bn)
-        knight2b = Knight(6*self.square_size, 7*self.square_size, self.square_size, 'black', bn)
-        self.addItem(knight1b)
-        self.addItem(knight2b)
-
-        bishop1b = Bishop(2*self.square_size, 0*self.square_size, self.square_size, 'white', wb)
-        bishop2b = Bishop(5*self.square_size, 0*self.square_size, self.square_size, 'white', wb)
-        self.addItem(bishop1b)
-        self.addItem(bishop2b)
-        bishop1w = Bishop(2*self.square_size, 7*self.square_size, self.square_size, 'black', bb)
-        bishop2w = Bishop(5*self.square_size, 7*self.square_size, self.square_size, 'black', bb)
-        self.addItem(bishop1w)
-        self.addItem(bishop2w)
-
-        kingw = King(3*self.square_size, 0*self.square_size, self.square_size, 'white', wk)
-        queenw = Queen(4*self.square_size, 0*self.square_size, self.square_size, 'white', wq)
-        self.addItem(kingw)
-        self.addItem(queenw)
-        kingb = King(4*self.square_size, 7*self.square_size, self.square_size, 'black', bk)
-        queenb = Queen(3*self.square_size, 7*self.square_size, self.square_size, 'black', bq)
-        self.addItem(kingb)
-        self.addItem(queenb)
-        
-    def update_board(self, x, y, fig):
-        """
-        Update the board after a move.
+        self.setSceneRect(0, 0, 8 * self.square_size, 8 * self.square_size)
+        light, dark = self.colors[self.b_view - 1]
+        self.set_board_color(QColor(light), QColor(dark))
+        self.highlight = Highlight(self.square_size)
+        super().addItem(self.highlight)
+
+        for sq in range(64):
+            piece = self.position.piece_at(sq)
+            if piece is not None:
+                self.add_piece(piece[0], piece[1], sq)
+
+    def set_board_color(self, light, dark):
+        """
+        Change the colours of the board squares.
+
+        Parameters:
+        - light (QColor): Color of the light squares.
+        - dark (QColor): Color of the dark squares.
+
+        """
+        self.background = board_pixmap(light, dark, self.square_size)
+        self.invalidate(self.sceneRect(), QGraphicsScene.BackgroundLayer)
+
+    def drawBackground(self, painter, rect):
+        """
+        Paint the cached board image; the squares are not scene items.
+
+        """
+        painter.drawPixmap(0, 0, self.background)
+
+    def load_fen(self, fen):
+        """
+        Set up the position of a FEN string on the board in one batch.
+
+        Piece items already on the scene are moved to their new squares
+        where the piece fits, so only missing pieces are created (with their
+        pixmaps) and surplus ones removed.
+
+        Parameters:
+        - fen (str): Position in Forsyth-Edwards Notation.
+
+        Raises:
+        - ValueError: If the string is not a valid FEN; the board is left unchanged.
+
+        """
+        position = parse_fen(fen)
+        spare = {}
+        for row in self.occupancy:
+            for item in row:
+                if item is not None:
+                    key = (COLOR_NAMES.index(item.color), PIECE_CLASSES.index(type(item)))
+                    spare.setdefault(key, []).append(item)
+        self.occupancy = [[None] * 8 for _ in range(8)]
+        self.position = position
+        self.game = start_game(position)
+        self.history = []
+        self.redo_moves = []
+
+        for sq, piece in enumerate(position.board):
+            if piece is None:
+                continue
+            items = spare.get(piece)
+            if items:
+                self.place_item(items.pop(), sq)
+            else:
+                self.add_piece(piece[0], piece[1], sq)
+        for items in spare.values():
+            for item in items:
+                super().removeItem(item)
+
+        self.current_turn = COLOR_NAMES[position.turn]
+        self.update_check()
+        if self.clock is not None:
+            self.clock.switch(position.turn)
+        self.start_engine_turn()
+
+    def to_fen(self):
+        """
+        Return the current position as a FEN string.
+
+        """
+        return to_fen(self.position)
+
+    def save_pgn(self, path):
+        """
+        Append the game played so far to a PGN file.
+
+        Parameters:
+        - path (str): PGN file, created if it does not exist.
+
+        """
+        if self.clock is not None and self.clock.flagged is not None:
+            self.game.result = '0-1' if self.clock.flagged == WHITE else '1-0'
+        else:
+            self.game.result = game_result(self.position)
+        with open(path, 'a', encoding='utf-8') as out:
+            write_game(out, self.game)
+
+    def square_at(self, x, y):
+        """
+        Return the position square under scene coordinates.
+
+        Parameters:
+        - x (float): Scene x-coordinate.
+        - y (float): Scene y-coordinate.
+
+        Returns:
+        - int: Square index, or None if the point is off the board.
+
+        """
+        col = int(x // self.square_size)
+        row = int(y // self.square_size)
+        if not (0 <= col < 8 and 0 <= row < 8):
+            return None
+        return square(7 - col, row)
+
+    def square_pos(self, sq):
+        """
+        Return the scene coordinates of the top-left corner of a position square.
+
+        """
+        return (7 - square_file(sq)) * self.square_size, square_rank(sq) * self.square_size
+
+    def addItem(self, item):
+        """
+        Add an item to the scene, recording pieces in the occupancy array.
+
+        """
+        super().addItem(item)
+        self.occupancy[int(item.y // self.square_size)][int(item.x // self.square_size)] = item
+
+    def removeItem(self, item):
+        """
+        Remove an item from the scene, clearing its cell in the occupancy array.
+
+        """
+        super().removeItem(item)
+        row = int(item.y // self.square_size)
+        col = int(item.x // self.square_size)
+        if self.occupancy[row][col] is item:
+            self.occupancy[row][col] = None
+
+    def item_at_square(self, sq):
+        """
+        Return the piece item standing on a square, or None.
+
+        """
+        return self.occupancy[square_rank(sq)][7 - square_file(sq)]
+
+    def place_item(self, item, sq):
+        """
+        Move a piece item to a square, keeping the occupancy array in step.
+
+        Parameters:
+        - item (QGraphicsItem): Piece item to move.
+        - sq (int): Target square.
+
+        """
+        row = int(item.y // self.square_size)
+        col = int(item.x // self.square_size)
+        if self.occupancy[row][col] is item:
+            self.occupancy[row][col] = None
+        item.x, item.y = self.square_pos(sq)
+        item.setPos(item.x, item.y)
+        self.occupancy[square_rank(sq)][7 - square_file(sq)] = item
+
+    def add_piece(self, color, piece_type, sq):
+        """
+        Create a piece item on a square of the scene.
+
+        Parameters:
+        - color (int): Piece colour (WHITE or BLACK).
+        - piece_type (int): Piece type of the rules core.
+        - sq (int): Square to put the piece on.
+
+        Returns:
+        - QGraphicsItem: The new piece item.
+
+        """
+        x, y = self.square_pos(sq)
+        item = PIECE_CLASSES[piece_type](x, y, self.square_size, COLOR_NAMES[color], PIECE_IMAGES[color][piece_type])
+        self.addItem(item)
+        return item
+
+    def remove_piece(self, item):
+        """
+        Take a piece item off the scene and out of the position.
+
+        The edited position cannot be reached by moves, so the game record
+        and the undo history start over from it.
+
+        """
+        sq = self.square_at(item.x, item.y)
+        if sq is not None:
+            self.position.remove_piece(sq)
+            self.position.update_checkers()
+            self.position.update_hash()
+            self.position.history = []
+            self.game = start_game(self.position)
+            self.history = []
+            self.redo_moves = []
+        self.removeItem(item)
+        self.update_check()
+        # A search still running was started on the position before the edit
+        self.start_engine_turn()
+
+    def is_valid_move(self, item, x, y):
+        """
+        Check if a piece item may move to the given coordinates.
 
         Parameters:
+        - item (QGraphicsItem): Piece item to move.
         - x (int): Target x-coordinate for the move.
         - y (int): Target y-coordinate for the move.
-        - fig (str): Name of the chess piece class.
+
+        Returns:
+        - bool: True if the move is legal for the side to move.
+
+        """
+        return bool(self.find_moves(item, x, y))
+
+    def legal_moves(self):
+        """
+        Return the legal moves of the side to move, computed once per position.
+
+        The list is cached under the position's Zobrist hash, so repeated
+        highlight and validity queries during one ply reuse a single generation.
+
+        Returns:
+        - dict: Origin square mapped to the list of legal moves from it.
+
+        """
+        key = self.hash
+        if key != self.moves_key:
+            moves = {}
+            for move in self.position.legal_moves():
+                moves.setdefault(move_from(move), []).append(move)
+            self.moves = moves
+            self.moves_key = key
+        return self.moves
+
+    def game_end(self):
+        """
+        Return how the game ended in the current position.
+
+        Repetitions are found in the position's hash history, looking back
+        no further than the last capture or pawn move.
+
+        Returns:
+        - str: 'Time forfeit', 'Checkmate', 'Stalemate', 'Threefold repetition'
+          or 'Fifty-move rule', or None while the game goes on.
+
+        """
+        if self.clock is not None and self.clock.flagged is not None:
+            return 'Time forfeit'
+        if not self.legal_moves():
+            return 'Checkmate' if self.position.checkers else 'Stalemate'
+        if self.position.halfmove_clock >= 100:
+            return 'Fifty-move rule'
+        if self.position.repetitions() >= 2:
+            return 'Threefold repetition'
+        return None
+
+    def find_moves(self, item, x, y):
+        """
+        Return the legal moves of a piece item to the square under the given coordinates.
+
+        There is more than one only for a promotion.
+
+        """
+        from_sq = self.square_at(item.x, item.y)
+        to_sq = self.square_at(x, y)
+        if from_sq is None or to_sq is None:
+            return []
+        return [move for move in self.legal_moves().get(from_sq, ()) if move_to(move) == to_sq]
+
+    def possible_squares(self, item):
+        """
+        Return the squares a piece item may move to, read from the cached legal moves.
+
+        """
+        from_sq = self.square_at(item.x, item.y)
+        return [move_to(move) for move in self.legal_moves().get(from_sq, ())]
+
+    def show_moves(self, item):
+        """
+        Highlight the squares a piece item may move to.
+
+        """
+        self.highlight.set_squares([self.square_pos(sq) for sq in self.possible_squares(item)])
+
+    def hide_moves(self):
+        """
+        Remove the move highlights.
+
+        """
+        self.highlight.set_squares([])
+
+    def make_move(self, item, x, y, promotion=None):
+        """
+        Move a piece item to the given coordinates if the move is legal.
+
+        Parameters:
+        - item (QGraphicsItem): Piece item to move.
+        - x (int): Target x-coordinate for the move.
+        - y (int): Target y-coordinate for the move.
+        - promotion (int): Promotion piece type; the player is asked when needed and None.
+
+        Returns:
+        - bool: True if the move was played.
+
+        """
+        if self.engine_color == self.position.turn or self.game_end() is not None:
+            return False
+        moves = self.find_moves(item, x, y)
+        if not moves:
+            return False
+        if len(moves) > 1:
+            if promotion is None:
+                promotion = promote_pawn(item)
+            moves = [move for move in moves if move_promotion(move) == promotion]
+        self.play(moves[0])
+        return True
+
+    def play(self, move):
+        """
+        Play a legal move on the position and mirror it on the scene.
+
+        The moves taken back are forgotten, unless this is the next of them.
+
+        Parameters:
+        - move (int): Encoded legal move of the side to move.
+
+        """
+        if self.redo_moves and self.redo_moves[-1] == move:
+            self.redo_moves.pop()
+        else:
+            self.redo_moves = []
+        color = self.position.turn
+        self._apply(move)
+        if self.clock is not None:
+            self.clock.press(color)
+        self._turn_changed()
+
+    def _apply(self, move):
+        """
+        Play a move on the position, the scene and the game record.
+
+        """
+        item = self.item_at_square(move_from(move))
+        captured_sq = self.position.captured_square(move)
+        if captured_sq is not None:
+            self.removeItem(self.item_at_square(captured_sq))
+        rook = self.position.castling_rook(move)
+        if rook is not None:
+            self.place_item(self.item_at_square(rook[0]), rook[1])
+
+        color = self.position.turn
+        self.history.append(self.position.make_move(move))
+        self.game.moves.append(move)
+        if move_promotion(move):
+            self.removeItem(item)
+            self.add_piece(color, move_promotion(move), move_to(move))
+        else:
+            self.place_item(item, move_to(move))
+
+    def _unapply(self):
+        """
+        Take back the last move on the position, the scene and the game record.
+
+        Only the items the move touched are put back, from its undo record.
+
+        Returns:
+        - int: The move taken back.
+
+        """
+        undo = self.history.pop()
+        move = undo[0]
+        self.game.moves.pop()
+        color = self.position.turn ^ 1
+        item = self.item_at_square(move_to(move))
+        if move_promotion(move):
+            self.removeItem(item)
+            self.add_piece(color, PAWN, move_from(move))
+        else:
+            self.place_item(item, move_from(move))
+        self.position.unmake_move(undo)
+        captured = undo[1]
+        if captured is not None:
+            self.add_piece(captured[0], captured[1], self.position.captured_square(move))
+        rook = self.position.castling_rook(move)
+        if rook is not None:
+            self.place_item(self.item_at_square(rook[1]), rook[0])
+        return move
+
+    def _turn_changed(self):
+        """
+        Refresh the turn and check state, switch the clocks and let the
+        engine respond to the new position.
+
+        """
+        self.current_turn = COLOR_NAMES[self.position.turn]
+        self.update_check()
+        end = self.game_end()
+        if end is not None:
+            print("%s, %s" % (end, game_result(self.position)))
+        if self.clock is not None:
+            if end is None:
+                self.clock.switch(self.position.turn)
+            else:
+                self.clock.pause()
+        self.start_engine_turn()
+
+    def _plies_to_step(self, moves):
+        """
+        Return the plies an undo or redo steps over: two against the computer
+        while the player is to move, so its reply goes with the player's move, else one.
+
+        """
+        if self.engine_color is not None and self.position.turn != self.engine_color and len(moves) >= 2:
+            return 2
+        return 1
+
+    def undo_move(self):
+        """
+        Take back the player's last move.
+
+        Against the computer its reply is taken back as well, so the player
+        is to move again; a search still running is abandoned.
+
+        Returns:
+        - bool: True if a move was taken back.
+
+        """
+        if not self.history:
+            return False
+        for _ in range(self._plies_to_step(self.history)):
+            self.redo_moves.append(self._unapply())
+        self._turn_changed()
+        return True
+
+    def redo_move(self):
+        """
+        Play again the move last taken back, with the computer's reply to it.
+
+        Returns:
+        - bool: True if a move was played.
+
+        """
+        if not self.redo_moves:
+            return False
+        for _ in range(self._plies_to_step(self.redo_moves)):
+            self._apply(self.redo_moves.pop())
+        self._turn_changed()
+        return True
+
+    def play_notation(self, text):
+        """
+        Play a move written in algebraic notation.
+
+        SAN and LAN are accepted with English or Polish piece letters
+        (e.g. 'Nf3', 'Sf3', 'exd8=H', 'O-O', 'g1f3'); the text must name
+        exactly one legal move of the side to move.
+
+        Parameters:
+        - text (str): The move.
+
+        Returns:
+        - int: The move played.
+
+        Raises:
+        - ValueError: If the text is not a legal, unambiguous move, the computer is to move or the game is over.
+
+        """
+        if self.game_end() is not None:
+            raise ValueError("The game is over: %s" % self.game_end())
+        if self.engine_color == self.position.turn:
+            raise ValueError("The computer is to move")
+        move = parse_notation(self.position, text)
+        self.play(move)
+        return move
+
+    def time_forfeit(self, color):
+        """
+        End the game when a side's time runs out; connected to the clock's on_flag.
+
+        """
+        print("%s lost on time, %s" % (COLOR_NAMES[color].capitalize(), '0-1' if color == WHITE else '1-0'))
+        self.start_engine_turn()
+
+    def engine_move_time(self):
+        """
+        Return the seconds the computer may think on this move: engine_time,
+        or less when the time left on its clock does not allow that much.
+
+        """
+        if self.clock is None:
+            return self.engine_time
+        remaining = self.clock.remaining(self.position.turn) / 1000
+        return min(self.engine_time, allot_time(remaining, self.clock.increment / 1000))
+
+    def start_engine_turn(self):
+        """
+        Start the engine on the current position, replacing any search still running.
+
+        When the computer is to move it searches for engine_time seconds and
+        plays its best move; otherwise, while analysing, it searches until
+        the next move. The search runs in the worker process, so the event
+        loop stays free and the timer only polls while a search is active.
+
+        """
+        self.analysis = None
+        if self.game_end() is not None:
+            self.worker.cancel()
+            self.worker_timer.stop()
+        elif self.engine_color == self.position.turn:
+            self.worker.analyse(self.to_fen(), self.engine_move_time(), history=self.position.history)
+            self.worker_timer.start()
+        elif self.analysing:
+            self.worker.analyse(self.to_fen(), history=self.position.history)
+            self.worker_timer.start()
+        else:
+            self.worker.cancel()
+            self.worker_timer.stop()
+
+    def set_analysing(self, enabled):
+        """
+        Switch continuous analysis of the position on or off.
+
+        """
+        self.analysing = enabled
+        self.start_engine_turn()
+
+    def poll_worker(self):
+        """
+        Handle the results the engine has sent for the current position.
+
+        Progress is printed; the computer's best move is played if it is
+        still legal, which it need not be once the board has been edited.
+
+        """
+        for message in self.worker.poll():
+            if message['type'] == 'info':
+                self.analysis = message
+                print("depth %d  score %s  nodes %d  nps %.0f  pv %s" % (
+                    message['depth'], format_score(message['score']), message['nodes'], message['nps'],
+                    ' '.join(move_uci(move) for move in message['pv'])))
+            else:
+                self.worker_timer.stop()
+                move = message['move']
+                if (move is not None and self.engine_color == self.position.turn
+                        and move in self.legal_moves().get(move_from(move), ())):
+                    self.play(move)
+
+    def close_worker(self):
+        """
+        Stop the engine process.
 
         """
-        for item in self.items():
-            fig_class = globals()[fig]
-            if isinstance(item, fig_class):
-                if item.is_valid_move(x, y):
-                    item.move(x,y)
+        self.worker_timer.stop()
+        self.worker.close()
 
 
 
@@ -3,38 +3,63 @@ from PyQt5 import QtCore, QtGui
 from PyQt5.QtGui import *
 from PyQt5.QtCore import *
 import sys
+import time
+
+# Repaints per second while a clock is running
+FRAME_RATE = 30
+
+# How the increment of a time control is given: added after every move,
+# added up to the time the move took, or waited before the clock counts
+INCREMENT_MODES = ('fischer', 'bronstein', 'delay')
 
 class Clock(QWidget):
     """
     Clock class represents a simple clock widget.
 
+    The remaining time is measured with time.monotonic(), so it stays exact
+    however late the timer fires; the timer only asks for repaints, at most
+    fps times per second and only while the clock is running.
+
     Attributes:
-    - timer (QTimer): Timer for periodic updates.
-    - time (int): Current time in milliseconds.
+    - time (float): Remaining time in milliseconds at the last tick.
     - count (bool): Flag indicating whether the countdown is active.
+    - clickable (bool): Whether a click starts and stops the clock; off when a GameClock runs it.
     - hPointer, mPointer, sPointer, msPointer (QPolygon): Polygons representing hour, minute, second, and millisecond pointers.
     - bColor, sColor, msColor (QColor): Colors for pointers.
-    - timer (QTimer): Timer for continuous updates.
+    - bBrush, sBrush, msBrush (QBrush): Brushes the pointers are filled with.
+    - face (QPixmap): Static dial drawn once for the current widget size, or None.
+    - timer (QTimer): Timer repainting the running clock.
 
     Methods:
-    - count_down(): Decrement time and update widget.
+    - remaining(now): Return the remaining time in milliseconds.
+    - start(now, delay): Start the countdown.
+    - stop(now): Stop the countdown.
+    - count_down(): Bring the time up to date and repaint.
+    - draw_face(): Draw the static dial into the face pixmap.
+    - resizeEvent(event): Drop the face pixmap drawn for the old size.
     - paintEvent(event): Paint the clock widget.
     - mousePressEvent(event): Toggle countdown on mouse press.
 
     """
 
-    def __init__(self):
+    def __init__(self, fps=FRAME_RATE):
         """
         Initialize the Clock widget.
 
         - Set up timers and initial properties.
 
+        Parameters:
+        - fps (int): Most repaints per second while the clock runs.
+
         """
         super().__init__()
         self.timer = QTimer(self)
+        self.timer.setInterval(max(1, 1000 // fps))
         self.timer.timeout.connect(self.count_down)
         self.time = 5 * 60 * 1000
-        self.count = True
+        self.count = False
+        self.clickable = True
+        self._last = time.monotonic()
         self.setWindowTitle('Clock')
         self.setGeometry(200, 200, 300, 300)
         self.setStyleSheet("background : white;")
@@ -45,49 +70,126 @@ class Clock(QWidget):
         self.bColor = Qt.black
         self.sColor = Qt.red
         self.msColor = Qt.blue
+        self.bBrush = QBrush(self.bColor)
+        self.sBrush = QBrush(self.sColor)
+        self.msBrush = QBrush(self.msColor)
+        self.face = None
+
+        self.start()
+
+    def remaining(self, now=None):
+        """
+        Return the remaining time in milliseconds, exact at the moment of the call.
+
+        Parameters:
+        - now (float): time.monotonic() reading to use, so several clocks can share one.
+
+        """
+        if not self.count:
+            return self.time
+        if now is None:
+            now = time.monotonic()
+        return max(0.0, self.time - max(0.0, now - self._last) * 1000)
 
-        self.timer.start(1)
+    def start(self, now=None, delay=0):
+        """
+        Start the countdown, unless the time has run out.
+
+        Parameters:
+        - now (float): time.monotonic() reading the countdown starts from.
+        - delay (float): Milliseconds to wait before the time starts going down.
+
+        """
+        if self.count or self.time <= 0:
+            return
+        self._last = (time.monotonic() if now is None else now) + delay / 1000
+        self.count = True
+        self.timer.start()
+
+    def stop(self, now=None):
+        """
+        Stop the countdown, keeping the time used up to now.
+
+        """
+        if self.count:
+            self.time = self.remaining(now)
+            self.count = False
+        self.timer.stop()
+        self.update()
 
     def count_down(self):
         """
-        Decrement the time and update the widget.
+        Bring the time up to date from the monotonic clock and update the widget.
 
-        If counting, decrement the time. If the time reaches zero, stop the countdown.
+        If the time reaches zero, stop the countdown.
 
         """
         if self.count:
-            self.time -= 1
+            now = time.monotonic()
+            if now > self._last:
+                self.time = max(0.0, self.time - (now - self._last) * 1000)
+                self._last = now
             if self.time <= 0:
-                self.time = 0
-                self.count = False
-
+                self.stop()
+                return
         self.update()
 
-        
 
+    def draw_face(self):
+        """
+        Draw the static dial (the scale) into the face pixmap, at the widget's size and pixel ratio.
+
+        """
+        rec = min(self.width(), self.height())
+        ratio = self.devicePixelRatioF()
+        self.face = QPixmap(int(self.width() * ratio), int(self.height() * ratio))
+        self.face.setDevicePixelRatio(ratio)
+        self.face.fill(Qt.transparent)
+
+        painter = QPainter(self.face)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.translate(self.width() / 2, self.height() / 2)
+        painter.scale(rec / 200, rec / 200)
+        painter.setPen(QPen(self.bColor))
+        for i in range(0, 60, 5):
+            painter.drawLine(87, 0, 97, 0)
+            painter.rotate(30)
+        painter.end()
+
+    def resizeEvent(self, event):
+        """
+        Drop the face pixmap, so the next paint draws it for the new size.
+
+        """
+        self.face = None
+        super().resizeEvent(event)
 
     def paintEvent(self, event):
         """
         Paint the clock widget.
 
-        Draw the clock face, pointers, and scale.
+        Copy the cached dial and draw the pointers over it.
 
         """
         rec = min(self.width(), self.height())
+        remaining = self.remaining()
+        if self.face is None:
+            self.draw_face()
 
         painter = QPainter(self)
+        painter.drawPixmap(0, 0, self.face)
 
-        def drawPointer(color, rotation, pointer):
+        def drawPointer(brush, rotation, pointer):
             """
             Helper method to draw a pointer on the clock face.
 
             Parameters:
-            - color: Color of the pointer.
+            - brush: Brush the pointer is filled with.
             - rotation: Rotation angle for the pointer.
             - pointer: QPolygon defining the shape of the pointer.
 
             """
-            painter.setBrush(QBrush(color))
+            painter.setBrush(brush)
             painter.save()
             painter.rotate(rotation)
             painter.drawConvexPolygon(pointer)
@@ -98,18 +200,10 @@ class Clock(QWidget):
         painter.scale(rec / 200, rec / 200)
         painter.setPen(QtCore.Qt.NoPen)
 
-        drawPointer(self.bColor, (30 * (self.time / (1000*60*60) % 12 + self.time / (1000*60) % 360 / 60)), self.hPointer)
-        drawPointer(self.bColor, (6 * (self.time / (1000*60) % 360 + self.time / 1000 % 60 / 60)), self.mPointer)
-        drawPointer(self.sColor, (6 * (self.time / 1000) % 360), self.sPointer)
-        drawPointer(self.msColor, (360 * ((self.time % 1000) / 1000)), self.msPointer)
-
-
-
-        painter.setPen(QPen(self.bColor))
-        for i in range(0, 60):
-            if (i % 5) == 0:
-                painter.drawLine(87, 0, 97, 0)
-            painter.rotate(6)
+        drawPointer(self.bBrush, (30 * (remaining / (1000*60*60) % 12 + remaining / (1000*60) % 360 / 60)), self.hPointer)
+        drawPointer(self.bBrush, (6 * (remaining / (1000*60) % 360 + remaining / 1000 % 60 / 60)), self.mPointer)
+        drawPointer(self.sBrush, (6 * (remaining / 1000) % 360), self.sPointer)
+        drawPointer(self.msBrush, (360 * ((remaining % 1000) / 1000)), self.msPointer)
 
         painter.end()
 
@@ -118,10 +212,177 @@ class Clock(QWidget):
         Toggle the countdown on mouse press.
 
         """
+        if not self.clickable:
+            return
         if not self.count:
-            self.count = True
+            self.start()
         else:
-            self.count = False
+            self.stop()
+
+
+class GameClock:
+    """
+    GameClock class runs the two clocks of a game like a chess clock.
+
+    Both clocks read the same time.monotonic() instant whenever the turn
+    passes, so no time is lost or gained between them. Only the running
+    clock repaints, and a single-shot timer set to the moment its time
+    would run out detects the flag fall, so nothing is called back every
+    millisecond.
+
+    Attributes:
+    - clocks (list): Clock widgets indexed by colour.
+    - base (float): Starting time of each side in milliseconds.
+    - increment (float): Increment or delay per move in milliseconds.
+    - mode (str): One of INCREMENT_MODES.
+    - turn (int): Colour whose clock runs, or None while stopped.
+    - flagged (int): Colour whose time ran out, or None.
+    - on_flag (callable): Called with the colour whose time ran out.
+    - flag_timer (QTimer): Single-shot timer firing when the running clock reaches zero.
+
+    Methods:
+    - set_time_control(base, increment, mode): Set both clocks back to a new time control.
+    - switch(turn): Run the clock of a side, without an increment.
+    - press(color): End a side's move: add its increment and start the other clock.
+    - pause(): Stop both clocks.
+    - remaining(color): Return a side's remaining time in milliseconds.
+
+    """
+
+    def __init__(self, white_clock, black_clock, base=5 * 60 * 1000, increment=0, mode='fischer', on_flag=None):
+        """
+        Initialize the controller and set both clocks to the time control.
+
+        Parameters:
+        - white_clock, black_clock (Clock): Clock widgets of the two sides.
+        - base (float): Starting time of each side in milliseconds.
+        - increment (float): Increment or delay per move in milliseconds.
+        - mode (str): 'fischer', 'bronstein' or 'delay'.
+        - on_flag (callable): Called with the colour whose time ran out.
+
+        """
+        self.clocks = [white_clock, black_clock]
+        for clock in self.clocks:
+            clock.clickable = False
+            clock.stop()
+        self.on_flag = on_flag
+        self.flag_timer = QTimer()
+        self.flag_timer.setSingleShot(True)
+        self.flag_timer.timeout.connect(self._check_flag)
+        self.turn = None
+        self._move_start = 0.0
+        self.set_time_control(base, increment, mode)
+
+    def set_time_control(self, base, increment=0, mode='fischer'):
+        """
+        Stop the clocks and give both sides the starting time of a new time control.
+
+        Raises:
+        - ValueError: If the mode is not one of INCREMENT_MODES.
+
+        """
+        if mode not in INCREMENT_MODES:
+            raise ValueError("Unknown increment mode: %r" % mode)
+        self.pause()
+        self.base = base
+        self.increment = increment
+        self.mode = mode
+        self.flagged = None
+        for clock in self.clocks:
+            clock.time = base
+            clock.update()
+
+    def remaining(self, color):
+        """
+        Return a side's remaining time in milliseconds, for the engine's time management.
+
+        """
+        return self.clocks[color].remaining()
+
+    def _run(self, turn, now):
+        """
+        Start the clock of a side and arm the flag timer.
+
+        """
+        clock = self.clocks[turn]
+        delay = self.increment if self.mode == 'delay' else 0
+        self.turn = turn
+        self._move_start = now
+        clock.start(now, delay)
+        self.flag_timer.start(int(clock.remaining(now) + delay) + 1)
+
+    def switch(self, turn):
+        """
+        Run the clock of a side, stopping the other, without an increment.
+
+        Used when the turn changes without a move being finished, e.g. at the
+        start of a game or after a take-back.
+
+        """
+        if self.flagged is not None or turn == self.turn:
+            return
+        now = time.monotonic()
+        if self.turn is not None:
+            self.clocks[self.turn].stop(now)
+        self._run(turn, now)
+
+    def press(self, color):
+        """
+        End a side's move: stop its clock, add its increment and start the other clock.
+
+        A side whose time ran out before the move loses on time.
+
+        """
+        if self.flagged is not None:
+            return
+        now = time.monotonic()
+        clock = self.clocks[color]
+        clock.stop(now)
+        if clock.time <= 0:
+            self._flag(color)
+            return
+        if self.turn == color:
+            if self.mode == 'fischer':
+                clock.time += self.increment
+            elif self.mode == 'bronstein':
+                clock.time += min(self.increment, (now - self._move_start) * 1000)
+            clock.update()
+        self._run(color ^ 1, now)
+
+    def pause(self):
+        """
+        Stop both clocks, e.g. at the end of the game.
+
+        """
+        self.flag_timer.stop()
+        if self.turn is not None:
+            self.clocks[self.turn].stop()
+        self.turn = None
+
+    def _check_flag(self):
+        """
+        Flag the running side if its time is up; otherwise wait for the rest of it.
+
+        """
+        if self.turn is None:
+            return
+        remaining = self.clocks[self.turn].remaining()
+        if remaining <= 0:
+            self._flag(self.turn)
+        else:
+            self.flag_timer.start(int(remaining) + 1)
+
+    def _flag(self, color):
+        """
+        Record that a side ran out of time and stop the clocks.
+
+        """
+        self.pause()
+        self.clocks[color].time = 0
+        self.clocks[color].update()
+        self.flagged = color
+        if self.on_flag is not None:
+            self.on_flag(color)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,114 @@
+"""
+Static evaluation of a position for the search.
+
+The score is material plus piece-square bonuses, in centipawns from the
+point of view of the side to move. Both are folded into one table per
+colour, piece type and square, so evaluating a position is a single pass
+over the mailbox.
+
+- PIECE_VALUES[piece_type]: Material value of a piece type.
+- PIECE_SQUARE[color][piece_type][sq]: Value of a piece on a square, bonus included.
+- MATE: Score of delivering mate at the root; mate in n plies scores MATE - n.
+- MATE_BOUND: Scores at least this far from zero are mate scores.
+
+"""
+
+from rules.bitboard import WHITE, BLACK
+
+PIECE_VALUES = (100, 320, 330, 500, 900, 20000)
+
+MATE = 100000
+MAX_PLY = 64
+MATE_BOUND = MATE - MAX_PLY
+
+# Bonuses for white pieces, written from rank 8 (top row) down to rank 1
+_BONUSES = (
+    (  # pawn
+        0, 0, 0, 0, 0, 0, 0, 0,
+        50, 50, 50, 50, 50, 50, 50, 50,
+        10, 10, 20, 30, 30, 20, 10, 10,
+        5, 5, 10, 25, 25, 10, 5, 5,
+        0, 0, 0, 20, 20, 0, 0, 0,
+        5, -5, -10, 0, 0, -10, -5, 5,
+        5, 10, 10, -20, -20, 10, 10, 5,
+        0, 0, 0, 0, 0, 0, 0, 0,
+    ),
+    (  # knight
+        -50, -40, -30, -30, -30, -30, -40, -50,
+        -40, -20, 0, 0, 0, 0, -20, -40,
+        -30, 0, 10, 15, 15, 10, 0, -30,
+        -30, 5, 15, 20, 20, 15, 5, -30,
+        -30, 0, 15, 20, 20, 15, 0, -30,
+        -30, 5, 10, 15, 15, 10, 5, -30,
+        -40, -20, 0, 5, 5, 0, -20, -40,
+        -50, -40, -30, -30, -30, -30, -40, -50,
+    ),
+    (  # bishop
+        -20, -10, -10, -10, -10, -10, -10, -20,
+        -10, 0, 0, 0, 0, 0, 0, -10,
+        -10, 0, 5, 10, 10, 5, 0, -10,
+        -10, 5, 5, 10, 10, 5, 5, -10,
+        -10, 0, 10, 10, 10, 10, 0, -10,
+        -10, 10, 10, 10, 10, 10, 10, -10,
+        -10, 5, 0, 0, 0, 0, 5, -10,
+        -20, -10, -10, -10, -10, -10, -10, -20,
+    ),
+    (  # rook
+        0, 0, 0, 0, 0, 0, 0, 0,
+        5, 10, 10, 10, 10, 10, 10, 5,
+        -5, 0, 0, 0, 0, 0, 0, -5,
+        -5, 0, 0, 0, 0, 0, 0, -5,
+        -5, 0, 0, 0, 0, 0, 0, -5,
+        -5, 0, 0, 0, 0, 0, 0, -5,
+        -5, 0, 0, 0, 0, 0, 0, -5,
+        0, 0, 0, 5, 5, 0, 0, 0,
+    ),
+    (  # queen
+        -20, -10, -10, -5, -5, -10, -10, -20,
+        -10, 0, 0, 0, 0, 0, 0, -10,
+        -10, 0, 5, 5, 5, 5, 0, -10,
+        -5, 0, 5, 5, 5, 5, 0, -5,
+        0, 0, 5, 5, 5, 5, 0, -5,
+        -10, 5, 5, 5, 5, 5, 0, -10,
+        -10, 0, 5, 0, 0, 0, 0, -10,
+        -20, -10, -10, -5, -5, -10, -10, -20,
+    ),
+    (  # king
+        -30, -40, -40, -50, -50, -40, -40, -30,
+        -30, -40, -40, -50, -50, -40, -40, -30,
+        -30, -40, -40, -50, -50, -40, -40, -30,
+        -30, -40, -40, -50, -50, -40, -40, -30,
+        -20, -30, -30, -40, -40, -30, -30, -20,
+        -10, -20, -20, -20, -20, -20, -20, -10,
+        20, 20, 0, 0, 0, 0, 20, 20,
+        20, 30, 10, 0, 0, 10, 30, 20,
+    ),
+)
+
+PIECE_SQUARE = (
+    [[PIECE_VALUES[pt] + _BONUSES[pt][(7 - (sq >> 3)) * 8 + (sq & 7)] for sq in range(64)] for pt in range(6)],
+    [[PIECE_VALUES[pt] + _BONUSES[pt][(sq >> 3) * 8 + (sq & 7)] for sq in range(64)] for pt in range(6)],
+)
+
+
+def evaluate(pos):
+    """
+    Evaluate a position statically.
+
+    Parameters:
+    - pos (Position): Position to evaluate.
+
+    Returns:
+    - int: Score in centipawns, positive when the side to move is better.
+
+    """
+    score = 0
+    white = PIECE_SQUARE[WHITE]
+    black = PIECE_SQUARE[BLACK]
+    for sq, piece in enumerate(pos.board):
+        if piece is not None:
+            if piece[0] == WHITE:
+                score += white[piece[1]][sq]
+            else:
+                score -= black[piece[1]][sq]
+    return score if pos.turn == WHITE else -score
@@ -0,0 +1,394 @@
+"""
+Alpha-beta search for a computer opponent.
+
+Search runs negamax with alpha-beta pruning inside iterative deepening:
+each iteration searches one ply deeper than the last, its best line is
+tried first by the next one, and the move of the last completed iteration
+is played when the time budget runs out. Results are kept in a
+transposition table, which cuts off positions already searched deeply
+enough and supplies their best move. Moves are ordered by the previous
+best move (from the last iteration or the table), then captures by MVV-LVA (most valuable victim, least valuable
+attacker), then killer moves and finally the history heuristic. A
+quiescence search follows captures past the horizon. A position that
+already occurred, in the search or in the game before it (the position's
+hash history), scores as a draw.
+
+Run `python -m engine.search` to measure nodes per second and the depth
+reached in a given time.
+
+"""
+
+import argparse
+import sys
+import time
+from rules.bitboard import move_from, move_to, move_promotion, move_uci
+from rules.fen import STARTING_FEN, parse_fen
+from engine.evaluate import PIECE_VALUES, MATE, MAX_PLY, MATE_BOUND, evaluate
+from engine.tt import TranspositionTable, EXACT, LOWER, UPPER
+
+INFINITY = MATE + 1
+
+# Nodes searched between two looks at the clock
+CHECK_INTERVAL = 1024
+
+# Moves assumed left in the game when the next time control is not known
+DEFAULT_MOVES_TO_GO = 30
+
+
+class SearchTimeout(Exception):
+    """
+    Raised inside the search when the time budget is spent or a stop is requested.
+
+    """
+
+
+class Search:
+    """
+    Search class finds the best move of a position within a time budget.
+
+    Killer moves, history scores and the transposition table are kept
+    between searches, so a game played with one Search object keeps its
+    ordering knowledge.
+
+    Attributes:
+    - nodes (int): Nodes visited by the last search.
+    - depth (int): Deepest completed iteration of the last search.
+    - elapsed (float): Duration of the last search in seconds.
+    - best_move (int): Best move found so far, or None.
+    - score (int): Score of the best move in centipawns for the side to move.
+    - pv (list): Principal variation of the last completed iteration.
+    - killers (list): Two quiet moves per ply that caused a beta cutoff.
+    - history (list): history[color][from][to] scores of quiet moves that caused cutoffs.
+    - tt (TranspositionTable): Table of positions already searched.
+    - stop_event: Event (anything with is_set()) shared with another process; the search stops once it is set.
+
+    Methods:
+    - search(pos, time_limit, max_depth, info): Find the best move of a position.
+    - stop(): Ask a running search to return as soon as possible.
+    - nps(): Return the nodes per second of the last search.
+    - order_moves(pos, moves, ply, best): Sort moves so the likely best come first.
+
+    """
+
+    def __init__(self, tt=None, stop_event=None):
+        """
+        Initialize a search with empty ordering tables.
+
+        Parameters:
+        - tt (TranspositionTable): Table to use; a 16 MB one is allocated when None.
+        - stop_event: multiprocessing.Event, or any object with is_set(), that stops a running search when set.
+
+        """
+        self.nodes = 0
+        self.depth = 0
+        self.elapsed = 0.0
+        self.best_move = None
+        self.score = 0
+        self.pv = []
+        self.killers = [[None, None] for _ in range(MAX_PLY)]
+        self.history = [[[0] * 64 for _ in range(64)] for _ in range(2)]
+        self.tt = TranspositionTable() if tt is None else tt
+        self.stop_event = stop_event
+        self._deadline = None
+        self._stopped = False
+        self._follow_pv = False
+        self._start = 0.0
+
+    def stop(self):
+        """
+        Ask a running search to return as soon as possible.
+
+        """
+        self._stopped = True
+
+    def nps(self):
+        """
+        Return the nodes per second of the last search.
+
+        """
+        return self.nodes / self.elapsed if self.elapsed > 0 else 0.0
+
+    def search(self, pos, time_limit=None, max_depth=MAX_PLY, info=None, first_depth=1):
+        """
+        Find the best move of a position.
+
+        A new iteration is only started while less than half of the budget
+        is used, as it would rarely complete otherwise.
+
+        Parameters:
+        - pos (Position): Position to search; it is not modified, as moves
+          are made and unmade on a copy that a stopped search may leave behind.
+        - time_limit (float): Budget in seconds, or None to search to max_depth.
+        - max_depth (int): Deepest iteration to run.
+        - info (callable): Called after each completed iteration with this Search.
+        - first_depth (int): Depth of the first iteration; parallel helpers
+          start deeper so they do not all search the same tree.
+
+        Returns:
+        - int: Best move, or None if the side to move has no legal moves.
+
+        """
+        self.nodes = 0
+        self.depth = 0
+        self.best_move = None
+        self.score = 0
+        self.pv = []
+        self._stopped = False
+        self.tt.new_search()
+        self.tt.reset_stats()
+        self._start = time.perf_counter()
+        self._deadline = None if time_limit is None else self._start + time_limit
+        pos = pos.copy()
+
+        root_moves = pos.legal_moves()
+        if root_moves:
+            self.best_move = root_moves[0]
+        for depth in range(min(first_depth, max_depth), min(max_depth, MAX_PLY - 1) + 1):
+            line = []
+            self._follow_pv = True
+            try:
+                score = self._negamax(pos, depth, -INFINITY, INFINITY, 0, line)
+            except SearchTimeout:
+                break
+            self.depth = depth
+            self.score = score
+            self.pv = line
+            if line:
+                self.best_move = line[0]
+            self.elapsed = time.perf_counter() - self._start
+            if info is not None:
+                info(self)
+            if len(root_moves) <= 1 or abs(score) >= MATE_BOUND:
+                break
+            if self._deadline is not None and self.elapsed * 2 > time_limit:
+                break
+        self.elapsed = time.perf_counter() - self._start
+        return self.best_move
+
+    def _negamax(self, pos, depth, alpha, beta, ply, line):
+        """
+        Search a position to a depth with alpha-beta pruning.
+
+        Parameters:
+        - pos (Position): Position to search.
+        - depth (int): Remaining depth in plies.
+        - alpha (int): Score the side to move is already guaranteed.
+        - beta (int): Score above which the opponent avoids this line.
+        - ply (int): Distance from the root.
+        - line (list): Filled with the principal variation found.
+
+        Returns:
+        - int: Score for the side to move.
+
+        """
+        self._visit()
+        if ply and pos.halfmove_clock >= 4 and pos.repetitions():
+            return 0
+        in_check = pos.checkers != 0
+        if in_check:
+            depth += 1
+        if depth <= 0 or ply >= MAX_PLY - 1:
+            return self._quiesce(pos, alpha, beta, ply)
+
+        moves = pos.legal_moves()
+        if not moves:
+            return -MATE + ply if in_check else 0
+        if ply and pos.halfmove_clock >= 100:
+            return 0
+
+        entry = self.tt.probe(pos.hash, ply)
+        best = None
+        if entry is not None:
+            tt_move, tt_depth, flag, tt_score = entry
+            if ply and tt_depth >= depth and (flag == EXACT or flag == LOWER and tt_score >= beta
+                                              or flag == UPPER and tt_score <= alpha):
+                return tt_score
+            if tt_move in moves:
+                best = tt_move
+        if self._follow_pv:
+            if ply < len(self.pv) and self.pv[ply] in moves:
+                best = self.pv[ply]
+            else:
+                self._follow_pv = False
+        alpha_orig = alpha
+        child_line = []
+        for move in self.order_moves(pos, moves, ply, best):
+            undo = pos.make_move(move)
+            child_line.clear()
+            score = -self._negamax(pos, depth - 1, -beta, -alpha, ply + 1, child_line)
+            pos.unmake_move(undo)
+            self._follow_pv = False
+            if score > alpha:
+                alpha = score
+                line[:] = [move] + child_line
+                if score >= beta:
+                    if pos.captured_square(move) is None and not move_promotion(move):
+                        self._store_killer(move, ply)
+                        self.history[pos.turn][move_from(move)][move_to(move)] += depth * depth
+                    break
+        flag = UPPER if alpha <= alpha_orig else LOWER if alpha >= beta else EXACT
+        self.tt.store(pos.hash, line[0] if line else 0, depth, flag, alpha, ply)
+        return alpha
+
+    def _quiesce(self, pos, alpha, beta, ply):
+        """
+        Search captures only, until the position is quiet.
+
+        The side to move may stand pat on the static evaluation, except when
+        in check, where every evasion is searched.
+
+        """
+        self._visit()
+        in_check = pos.checkers != 0
+        if not in_check:
+            stand_pat = evaluate(pos)
+            if stand_pat >= beta:
+                return stand_pat
+            if stand_pat > alpha:
+                alpha = stand_pat
+        moves = pos.legal_moves()
+        if not moves:
+            return -MATE + ply if in_check else alpha
+        if not in_check:
+            moves = [move for move in moves if pos.captured_square(move) is not None or move_promotion(move)]
+        if ply >= MAX_PLY - 1:
+            return alpha
+        for move in self.order_moves(pos, moves, ply, None):
+            undo = pos.make_move(move)
+            score = -self._quiesce(pos, -beta, -alpha, ply + 1)
+            pos.unmake_move(undo)
+            if score > alpha:
+                alpha = score
+                if score >= beta:
+                    break
+        return alpha
+
+    def order_moves(self, pos, moves, ply, best):
+        """
+        Sort moves so the likely best are searched first.
+
+        Parameters:
+        - pos (Position): Position the moves belong to.
+        - moves (list): Legal moves of the position.
+        - ply (int): Distance from the root, selecting the killer moves.
+        - best (int): Move to search first, such as the previous best move.
+
+        Returns:
+        - list: The moves from best to worst guess.
+
+        """
+        board = pos.board
+        killers = self.killers[ply]
+        history = self.history[pos.turn]
+
+        def priority(move):
+            if move == best:
+                return 1 << 30
+            from_sq = move_from(move)
+            to_sq = move_to(move)
+            captured_sq = pos.captured_square(move)
+            promotion = move_promotion(move)
+            if captured_sq is not None or promotion:
+                victim = PIECE_VALUES[board[captured_sq][1]] if captured_sq is not None else 0
+                return (1 << 28) + 10 * (victim + PIECE_VALUES[promotion] * bool(promotion)) \
+                    - PIECE_VALUES[board[from_sq][1]] // 100
+            if move == killers[0]:
+                return (1 << 27) + 1
+            if move == killers[1]:
+                return 1 << 27
+            return history[from_sq][to_sq]
+
+        return sorted(moves, key=priority, reverse=True)
+
+    def _store_killer(self, move, ply):
+        """
+        Remember a quiet move that caused a beta cutoff at a ply.
+
+        """
+        killers = self.killers[ply]
+        if killers[0] != move:
+            killers[1] = killers[0]
+            killers[0] = move
+
+    def _visit(self):
+        """
+        Count a node and stop the search once the budget is spent.
+
+        """
+        self.nodes += 1
+        if self.nodes % CHECK_INTERVAL == 0:
+            if (self._deadline is not None and time.perf_counter() >= self._deadline
+                    or self.stop_event is not None and self.stop_event.is_set()):
+                self._stopped = True
+        if self._stopped:
+            raise SearchTimeout()
+
+
+def allot_time(remaining, increment=0.0, moves_to_go=DEFAULT_MOVES_TO_GO):
+    """
+    Return the seconds to spend on a move, given the time left on the clock.
+
+    The remaining time is spread over the moves to go and most of the
+    increment is added, but never more than half the remaining time is used.
+
+    Parameters:
+    - remaining (float): Seconds left on the clock.
+    - increment (float): Seconds added after every move.
+    - moves_to_go (int): Moves left until the next time control.
+
+    """
+    return max(0.0, min(remaining / 2, remaining / max(1, moves_to_go) + increment * 0.8))
+
+
+def format_score(score):
+    """
+    Return a score as centipawns, or as the distance to mate.
+
+    """
+    if abs(score) >= MATE_BOUND:
+        plies = MATE - abs(score)
+        return 'mate %d' % ((plies + 1) // 2 if score > 0 else -((plies + 1) // 2))
+    return 'cp %d' % score
+
+
+def report(search, out=sys.stdout):
+    """
+    Print one line about a completed iteration: depth, score, nodes, speed,
+    transposition table hit rate and line.
+
+    """
+    out.write('depth %2d  score %-10s  nodes %9d  time %7.3fs  nps %8.0f  tt hits %5.1f%%  pv %s\n' % (
+        search.depth, format_score(search.score), search.nodes, search.elapsed, search.nps(),
+        100 * search.tt.hit_rate(), ' '.join(move_uci(move) for move in search.pv)))
+
+
+def main(argv=None):
+    """
+    Command-line entry point.
+
+    Searches a position for a time or to a depth and prints every completed
+    iteration, for sizing the hardware engine play needs.
+
+    """
+    parser = argparse.ArgumentParser(description="Search a position and report depth and nodes per second.")
+    parser.add_argument('-f', '--fen', default=STARTING_FEN, help="position to search (default the starting position)")
+    parser.add_argument('-t', '--time', type=float, default=5.0, help="time budget in seconds (default 5)")
+    parser.add_argument('-d', '--depth', type=int, default=MAX_PLY, help="deepest iteration to run")
+    parser.add_argument('--hash', type=float, default=16, help="transposition table size in MB (default 16)")
+    parser.add_argument('--threads', type=int, default=1, help="search processes sharing the table (default 1)")
+    args = parser.parse_args(argv)
+
+    if args.threads > 1:
+        from engine.smp import ParallelSearch
+        search = ParallelSearch(args.threads, args.hash)
+    else:
+        search = Search(TranspositionTable(args.hash))
+    move = search.search(parse_fen(args.fen), args.time, args.depth, report)
+    print('bestmove %s' % (move_uci(move) if move is not None else '(none)'))
+    if args.threads > 1:
+        search.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
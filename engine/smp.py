@@ -0,0 +1,304 @@
+"""
+Lazy SMP: one search spread over several processes.
+
+Every process searches the same root position with its own Search, and all
+of them read and write one transposition table placed in
+multiprocessing.shared_memory. The helpers find nothing the main search
+would not, but the results they store let the main search cut off or order
+moves it would otherwise have searched itself. Odd helpers start one ply
+deeper so the processes are not in lockstep. The main search decides the
+move and the time; the helpers stop when it returns.
+
+Run `python -m engine.smp --threads 1 2 4` to measure the speedup against
+the number of processes on a fixed set of positions.
+
+"""
+
+import argparse
+import multiprocessing
+import queue
+import sys
+import time
+from multiprocessing import shared_memory
+from rules.fen import STARTING_FEN, parse_fen, to_fen
+from engine.evaluate import MAX_PLY
+from engine.search import Search
+from engine.tt import TranspositionTable, BUCKET_BYTES
+
+# Positions searched by the speedup benchmark
+BENCH_POSITIONS = (
+    STARTING_FEN,
+    'r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1',
+    'r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10',
+    'r1bqkb1r/pppp1ppp/2n2n2/4p3/2B1P3/5N2/PPPP1PPP/RNBQK2R w KQkq - 4 4',
+    '8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1',
+    '8/k7/3p4/p2P1p2/P2P1P2/8/8/K7 w - - 0 1',
+)
+
+
+def _helper(index, shm_name, requests, done, nodes, stop_event):
+    """
+    Helper process loop: search each root position until the main search stops.
+
+    The helper's index is put on the done queue after every request, even
+    one whose search failed, so the main search never waits for it in vain.
+
+    """
+    shm = shared_memory.SharedMemory(name=shm_name)
+    search = Search(TranspositionTable(buffer=shm.buf), stop_event)
+
+    def info(search):
+        nodes[index] = search.nodes
+
+    while True:
+        request = requests.get()
+        if request is None:
+            break
+        fen, history, max_depth = request
+        pos = parse_fen(fen)
+        pos.history = history
+        try:
+            search.search(pos, None, max_depth, info, 1 + index % 2)
+            nodes[index] = search.nodes
+        finally:
+            done.put(index)
+    search.tt.release()
+    shm.close()
+
+
+class ParallelSearch:
+    """
+    ParallelSearch class runs a lazy SMP search over several processes.
+
+    It answers the same calls and attributes as Search, so it can replace it
+    wherever more than one core is available; nodes count all processes.
+
+    Attributes:
+    - threads (int): Number of processes searching, including this one.
+    - main (Search): The search run in this process, which decides the move.
+    - tt (TranspositionTable): This process's view of the shared table.
+    - stop_event: Event (anything with is_set()) that stops the search when set.
+
+    Methods:
+    - search(pos, time_limit, max_depth, info): Find the best move of a position.
+    - stop(): Ask a running search to return as soon as possible.
+    - nps(): Return the nodes per second of all processes in the last search.
+    - close(): Stop the helpers and free the shared table.
+
+    """
+
+    def __init__(self, threads, hash_mb=16, stop_event=None):
+        """
+        Create the shared table and start threads - 1 helper processes.
+
+        Parameters:
+        - threads (int): Number of processes searching, at least 1.
+        - hash_mb (float): Size of the shared transposition table in megabytes.
+        - stop_event: Event that stops a running search when set.
+
+        """
+        self.threads = max(1, threads)
+        size = max(1, int(hash_mb * (1 << 20)) // BUCKET_BYTES) * BUCKET_BYTES
+        self._shm = shared_memory.SharedMemory(create=True, size=size)
+        self.tt = TranspositionTable(buffer=self._shm.buf)
+        self.main = Search(self.tt, stop_event)
+        self._helper_stop = multiprocessing.Event()
+        self._nodes = multiprocessing.Array('q', self.threads, lock=False)
+        self._done = multiprocessing.Queue()
+        self._requests = []
+        self._helpers = []
+        for index in range(1, self.threads):
+            requests = multiprocessing.Queue()
+            process = multiprocessing.Process(target=_helper, daemon=True,
+                                              args=(index, self._shm.name, requests, self._done, self._nodes,
+                                                    self._helper_stop))
+            process.start()
+            self._requests.append(requests)
+            self._helpers.append(process)
+
+    @property
+    def stop_event(self):
+        """
+        Event that stops the search when set, shared with the main search.
+
+        """
+        return self.main.stop_event
+
+    @stop_event.setter
+    def stop_event(self, event):
+        self.main.stop_event = event
+
+    @property
+    def nodes(self):
+        """
+        Nodes visited by all processes; helpers report theirs after each iteration.
+
+        """
+        return self.main.nodes + sum(self._nodes[1:])
+
+    @property
+    def depth(self):
+        """
+        Deepest completed iteration of the main search.
+
+        """
+        return self.main.depth
+
+    @property
+    def score(self):
+        """
+        Score of the best move, from the main search.
+
+        """
+        return self.main.score
+
+    @property
+    def pv(self):
+        """
+        Principal variation of the main search.
+
+        """
+        return self.main.pv
+
+    @property
+    def best_move(self):
+        """
+        Best move found so far by the main search.
+
+        """
+        return self.main.best_move
+
+    @property
+    def elapsed(self):
+        """
+        Duration of the last search in seconds.
+
+        """
+        return self.main.elapsed
+
+    def nps(self):
+        """
+        Return the nodes per second of all processes in the last search.
+
+        """
+        return self.nodes / self.elapsed if self.elapsed > 0 else 0.0
+
+    def stop(self):
+        """
+        Ask a running search to return as soon as possible.
+
+        """
+        self.main.stop()
+
+    def search(self, pos, time_limit=None, max_depth=MAX_PLY, info=None):
+        """
+        Find the best move of a position with every process.
+
+        Parameters:
+        - pos (Position): Position to search; it is not modified.
+        - time_limit (float): Budget in seconds, or None to search to max_depth.
+        - max_depth (int): Deepest iteration to run.
+        - info (callable): Called after each completed iteration of the main search with this object.
+
+        Returns:
+        - int: Best move, or None if the side to move has no legal moves.
+
+        """
+        fen = to_fen(pos)
+        self._helper_stop.clear()
+        for index in range(self.threads):
+            self._nodes[index] = 0
+        for requests in self._requests:
+            requests.put((fen, pos.history, max_depth))
+        try:
+            move = self.main.search(pos, time_limit, max_depth, None if info is None else lambda _: info(self))
+        finally:
+            self._helper_stop.set()
+            self._wait_helpers()
+        return move
+
+    def _wait_helpers(self):
+        """
+        Wait until every helper still alive has finished its request.
+
+        """
+        pending = set(range(1, self.threads))
+        while pending:
+            try:
+                pending.discard(self._done.get(timeout=0.1))
+            except queue.Empty:
+                pending = {index for index in pending if self._helpers[index - 1].is_alive()}
+
+    def close(self):
+        """
+        Stop the helper processes and free the shared table.
+
+        """
+        self._helper_stop.set()
+        for requests in self._requests:
+            requests.put(None)
+        for process in self._helpers:
+            process.join(1)
+            if process.is_alive():
+                process.terminate()
+        self._helpers = []
+        self._requests = []
+        self.tt.release()
+        self._shm.close()
+        self._shm.unlink()
+
+
+def benchmark(thread_counts, depth, hash_mb=16, out=sys.stdout):
+    """
+    Measure the time to reach a fixed depth on BENCH_POSITIONS for each number of processes.
+
+    Each count starts from an empty table, so runs do not help each other.
+
+    Parameters:
+    - thread_counts (list): Numbers of processes to compare.
+    - depth (int): Depth every position is searched to.
+    - hash_mb (float): Size of the shared table in megabytes.
+    - out: Stream to write the report to.
+
+    Returns:
+    - list: (threads, seconds, nodes, speedup) per count, speedup being
+      relative to the first count.
+
+    """
+    rows = []
+    for threads in thread_counts:
+        search = ParallelSearch(threads, hash_mb)
+        elapsed = 0.0
+        nodes = 0
+        try:
+            for fen in BENCH_POSITIONS:
+                start = time.perf_counter()
+                search.search(parse_fen(fen), None, depth)
+                elapsed += time.perf_counter() - start
+                nodes += search.nodes
+        finally:
+            search.close()
+        speedup = rows[0][1] / elapsed if rows and elapsed > 0 else 1.0
+        rows.append((threads, elapsed, nodes, speedup))
+        out.write('threads %2d  time %8.3fs  nodes %10d  nps %9.0f  speedup %5.2f\n' % (
+            threads, elapsed, nodes, nodes / elapsed if elapsed > 0 else 0.0, speedup))
+    return rows
+
+
+def main(argv=None):
+    """
+    Command-line entry point for the speedup benchmark.
+
+    """
+    parser = argparse.ArgumentParser(description="Measure lazy SMP speedup against the number of processes.")
+    parser.add_argument('--threads', type=int, nargs='+', default=[1, multiprocessing.cpu_count()],
+                        help="numbers of processes to compare (default 1 and the number of CPUs)")
+    parser.add_argument('-d', '--depth', type=int, default=5, help="depth searched on every position (default 5)")
+    parser.add_argument('--hash', type=float, default=16, help="shared table size in MB (default 16)")
+    args = parser.parse_args(argv)
+    benchmark(args.threads, args.depth, args.hash)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,192 @@
+"""
+Transposition table for the search.
+
+Results are stored by Zobrist hash in one preallocated buffer of 64-bit
+words, so the table never grows past its memory budget and puts no load on
+the garbage collector. An entry is two words: the hash XORed with the data,
+and the data itself (best move, depth, bound type, search generation and
+score packed together). The XOR lets a reader detect an entry whose two
+words were written by different stores.
+
+Entries come in buckets of two. The first slot keeps the deepest result
+of the current search (depth-preferred), the second takes whatever does
+not qualify for the first (always-replace), so fresh shallow results are
+not lost and deep ones are not overwritten by them.
+
+"""
+
+from engine.evaluate import MATE_BOUND
+
+EXACT, LOWER, UPPER = 1, 2, 3
+
+ENTRY_WORDS = 2
+BUCKET_WORDS = 2 * ENTRY_WORDS
+BUCKET_BYTES = BUCKET_WORDS * 8
+
+_SCORE_OFFSET = 1 << 31
+
+
+class TranspositionTable:
+    """
+    TranspositionTable class stores search results by position hash in a fixed memory budget.
+
+    Attributes:
+    - size_mb (float): Memory used by the table in megabytes.
+    - buckets (int): Number of two-entry buckets.
+    - table (memoryview): The entries as unsigned 64-bit words.
+    - generation (int): Number of the current search, used to age out old entries.
+    - probes (int): Lookups since the statistics were reset.
+    - hits (int): Lookups that found their position.
+    - stores (int): Results written.
+    - replacements (int): Writes that evicted another position.
+
+    Methods:
+    - probe(key, ply): Look up a position.
+    - store(key, move, depth, flag, score, ply): Store a search result.
+    - new_search(): Start a new generation so old entries are replaced first.
+    - clear(): Empty the table.
+    - hit_rate(): Return the fraction of lookups that hit.
+    - usage(): Return the filled fraction of a sample of the table, in permille.
+    - reset_stats(): Zero the statistics.
+    - release(): Let go of the buffer, so shared memory can be closed.
+
+    """
+
+    def __init__(self, size_mb=16, buffer=None):
+        """
+        Allocate the table.
+
+        Parameters:
+        - size_mb (float): Memory budget in megabytes.
+        - buffer: Writable buffer to use instead of allocating one, such as
+          shared memory; its size overrides size_mb.
+
+        """
+        if buffer is None:
+            buffer = bytearray(max(1, int(size_mb * (1 << 20)) // BUCKET_BYTES) * BUCKET_BYTES)
+        self.buckets = len(buffer) // BUCKET_BYTES
+        if not self.buckets:
+            raise ValueError("Transposition table buffer is smaller than one bucket")
+        self._bytes = memoryview(buffer)[:self.buckets * BUCKET_BYTES]
+        self.table = self._bytes.cast('Q')
+        self.size_mb = self.buckets * BUCKET_BYTES / (1 << 20)
+        self.generation = 0
+        self.reset_stats()
+
+    def release(self):
+        """
+        Let go of the buffer; the table must not be used afterwards.
+
+        """
+        self.table.release()
+        self._bytes.release()
+
+    def reset_stats(self):
+        """
+        Zero the hit-rate statistics.
+
+        """
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+        self.replacements = 0
+
+    def hit_rate(self):
+        """
+        Return the fraction of lookups that found their position.
+
+        """
+        return self.hits / self.probes if self.probes else 0.0
+
+    def new_search(self):
+        """
+        Start a new generation, so entries of earlier searches are replaced first.
+
+        """
+        self.generation = (self.generation + 1) & 63
+
+    def clear(self):
+        """
+        Empty the table.
+
+        """
+        self._bytes[:] = bytes(len(self._bytes))
+        self.generation = 0
+
+    def usage(self):
+        """
+        Return how full the table is, in permille, from its first thousand entries.
+
+        """
+        table = self.table
+        count = min(1000, len(table) // ENTRY_WORDS)
+        used = sum(1 for index in range(count) if table[index * ENTRY_WORDS + 1])
+        return used * 1000 // count
+
+    def probe(self, key, ply=0):
+        """
+        Look up a position.
+
+        Parameters:
+        - key (int): Zobrist hash of the position.
+        - ply (int): Distance from the root, to turn stored mate scores back into distances from here.
+
+        Returns:
+        - tuple: (move, depth, flag, score), move being 0 when none was stored,
+          or None if the position is not in the table.
+
+        """
+        self.probes += 1
+        table = self.table
+        index = key % self.buckets * BUCKET_WORDS
+        for slot in (index, index + ENTRY_WORDS):
+            data = table[slot + 1]
+            if data and table[slot] ^ data == key:
+                self.hits += 1
+                score = (data >> 32) - _SCORE_OFFSET
+                if score >= MATE_BOUND:
+                    score -= ply
+                elif score <= -MATE_BOUND:
+                    score += ply
+                return data & 0xFFFF, data >> 16 & 0xFF, data >> 24 & 3, score
+        return None
+
+    def store(self, key, move, depth, flag, score, ply=0):
+        """
+        Store a search result.
+
+        The depth-preferred slot is taken when it is empty, holds the same
+        position, belongs to an earlier search or is not deeper than the
+        new result; otherwise the always-replace slot is used.
+
+        Parameters:
+        - key (int): Zobrist hash of the position.
+        - move (int): Best move found, or None.
+        - depth (int): Depth the position was searched to.
+        - flag (int): EXACT, LOWER (score is a lower bound) or UPPER (upper bound).
+        - score (int): Score for the side to move.
+        - ply (int): Distance from the root, so mate scores are stored relative to this position.
+
+        """
+        self.stores += 1
+        table = self.table
+        index = key % self.buckets * BUCKET_WORDS
+        slot = index
+        data = table[index + 1]
+        if data and table[index] ^ data != key:
+            if data >> 26 & 63 == self.generation and data >> 16 & 0xFF > depth:
+                slot = index + ENTRY_WORDS
+                data = table[slot + 1]
+        old_key = table[slot] ^ data if data else None
+        if old_key is not None and old_key != key:
+            self.replacements += 1
+        if not move and old_key == key:
+            move = data & 0xFFFF
+        if score >= MATE_BOUND:
+            score += ply
+        elif score <= -MATE_BOUND:
+            score -= ply
+        data = ((score + _SCORE_OFFSET) << 32 | self.generation << 26 | flag << 24
+                | max(0, min(depth, 255)) << 16 | (move or 0))
+        table[slot] = key ^ data
+        table[slot + 1] = data
@@ -0,0 +1,185 @@
+"""
+Engine search in a separate process.
+
+The GUI thread must never run a search: it would freeze the board and the
+clocks for the whole thinking time. AnalysisWorker owns a child process
+that searches positions sent to it as FEN strings and streams the result
+of every completed iteration back through a queue, which the GUI drains
+with poll() from a timer. A request can be cancelled at any time, e.g.
+when the player moves; results of an old request are dropped by poll().
+
+Messages returned by poll() are dicts with a 'type' key:
+- 'info': id, depth, score, nodes, nps, hit_rate, pv (list of moves).
+- 'bestmove': id, move (None if there is no legal move), score, depth.
+
+"""
+
+import multiprocessing
+import queue
+from rules.fen import parse_fen
+from engine.search import Search
+from engine.tt import TranspositionTable
+
+
+class _Superseded:
+    """
+    Stop signal of one request: set once the GUI has moved on to another request.
+
+    """
+
+    def __init__(self, latest, request_id):
+        """
+        Watch the shared id of the latest request for a change away from request_id.
+
+        """
+        self.latest = latest
+        self.request_id = request_id
+
+    def is_set(self):
+        """
+        Check if the request was cancelled or replaced.
+
+        """
+        return self.latest.value != self.request_id
+
+
+def _run(requests, results, latest, hash_mb):
+    """
+    Worker process loop: search each request and stream its progress.
+
+    Requests that were superseded before the worker got to them are skipped.
+
+    """
+    search = Search(TranspositionTable(hash_mb))
+    while True:
+        request = requests.get()
+        if request is None:
+            return
+        request_id, fen, history, time_limit, max_depth = request
+        if latest.value != request_id:
+            continue
+        search.stop_event = _Superseded(latest, request_id)
+
+        def info(search):
+            results.put({'type': 'info', 'id': request_id, 'depth': search.depth, 'score': search.score,
+                         'nodes': search.nodes, 'nps': search.nps(), 'hit_rate': search.tt.hit_rate(),
+                         'pv': list(search.pv)})
+
+        try:
+            pos = parse_fen(fen)
+        except ValueError:
+            # An edited board, e.g. without a king, has nothing to search
+            results.put({'type': 'bestmove', 'id': request_id, 'move': None, 'score': 0, 'depth': 0})
+            continue
+        pos.history = list(history)
+        move = search.search(pos, time_limit, max_depth, info)
+        results.put({'type': 'bestmove', 'id': request_id, 'move': move, 'score': search.score,
+                     'depth': search.depth})
+
+
+class AnalysisWorker:
+    """
+    AnalysisWorker class runs engine searches in a child process.
+
+    Attributes:
+    - request_id (int): Id of the latest request; results of older or cancelled ones are dropped.
+    - hash_mb (float): Transposition table size of the worker in megabytes.
+    - process (multiprocessing.Process): The worker process, None until started.
+
+    Methods:
+    - start(): Start the worker process.
+    - analyse(fen, time_limit, max_depth): Search a position, cancelling the current search.
+    - cancel(): Stop the current search.
+    - poll(): Return the messages of the latest request received so far.
+    - close(): Stop the worker process.
+
+    """
+
+    def __init__(self, hash_mb=16):
+        """
+        Initialize the worker; the process is started on the first request.
+
+        """
+        self.request_id = 0
+        self.hash_mb = hash_mb
+        self.process = None
+        self._requests = None
+        self._results = None
+        self._latest = None
+
+    def start(self):
+        """
+        Start the worker process, spawned rather than forked from the GUI.
+
+        """
+        if self.process is not None:
+            return
+        # The GUI process runs Qt threads, which a forked child would inherit in an unknown state
+        context = multiprocessing.get_context('spawn')
+        self._requests = context.Queue()
+        self._results = context.Queue()
+        self._latest = context.Value('q', 0)
+        self.process = context.Process(target=_run, daemon=True,
+                                        args=(self._requests, self._results, self._latest, self.hash_mb))
+        self.process.start()
+
+    def analyse(self, fen, time_limit=None, max_depth=64, history=()):
+        """
+        Search a position, cancelling any search still running.
+
+        Parameters:
+        - fen (str): Position to search.
+        - time_limit (float): Budget in seconds, or None to search until cancelled.
+        - max_depth (int): Deepest iteration to run.
+        - history (list): Hashes of the game's earlier positions, so repetitions are scored as draws.
+
+        Returns:
+        - int: Id of the request, carried by its messages.
+
+        """
+        self.start()
+        self.request_id += 1
+        self._latest.value = self.request_id
+        self._requests.put((self.request_id, fen, list(history), time_limit, max_depth))
+        return self.request_id
+
+    def cancel(self):
+        """
+        Stop the current search; its remaining messages are dropped.
+
+        """
+        if self.process is not None:
+            self._latest.value = 0
+
+    def poll(self):
+        """
+        Return the messages of the latest request that have arrived, without waiting.
+
+        Returns:
+        - list: Message dicts in arrival order.
+
+        """
+        messages = []
+        if self.process is None:
+            return messages
+        while True:
+            try:
+                message = self._results.get_nowait()
+            except queue.Empty:
+                return messages
+            if message['id'] == self._latest.value:
+                messages.append(message)
+
+    def close(self):
+        """
+        Stop the worker process.
+
+        """
+        if self.process is None:
+            return
+        self.cancel()
+        self._requests.put(None)
+        self.process.join(1)
+        if self.process.is_alive():
+            self.process.terminate()
+        self.process = None
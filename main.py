@@ -1,8 +1,10 @@
+import argparse
 import sys
-from PyQt5.QtWidgets import QApplication, QMainWindow, QGraphicsView, QDockWidget, QLineEdit
+from PyQt5.QtWidgets import QApplication, QMainWindow, QGraphicsView, QDockWidget, QLineEdit, QPushButton
 from PyQt5.QtCore import Qt
 from board import ChessBoard
-from clocks import Clock
+from clocks import Clock, GameClock, INCREMENT_MODES
+from rules.bitboard import COLOR_NAMES
 
 class Window(QMainWindow):
     """
@@ -12,12 +14,16 @@ class Window(QMainWindow):
     - scene (ChessBoard): Chess board scene for the game.
     - view (QGraphicsView): Graphics view displaying the chess board.
     - chess_dock_widget, clock1_dock_widget, clock2_dock_widget (QDockWidget): Dock widgets for chess board and two clocks.
+    - white_clock, black_clock (Clock): Clocks of white (top dock, like white's pieces) and black.
+    - game_clock (GameClock): Controller switching the clocks as the turn passes.
     - text_field (QLineEdit): Text field for entering chess moves.
+    - undo_button, redo_button (QPushButton): Buttons taking back and replaying moves.
+    - pgn_path (str): PGN file the game is appended to on close, or None.
 
     Methods:
     - __init__(): Initialize the main window and set up widgets.
     - handle_notation_move(): Handle chess move input in algebraic notation.
-    - convert_notation_to_coord(notation): Convert algebraic notation to board coordinates.
+    - closeEvent(event): Save the game and stop the engine process when the window closes.
 
     """
 
@@ -32,6 +38,7 @@ class Window(QMainWindow):
 
         # Chess board setup
         self.scene = ChessBoard()
+        self.pgn_path = None
         self.view = QGraphicsView(self.scene, self)
 
         # Dock widget for chess board
@@ -39,15 +46,21 @@ class Window(QMainWindow):
         self.chess_dock_widget.setWidget(self.view)
         self.chess_dock_widget.setAllowedAreas(Qt.LeftDockWidgetArea)
 
+        # Clocks of both sides, switched by the board on every move
+        self.white_clock = Clock()
+        self.black_clock = Clock()
+        self.game_clock = GameClock(self.white_clock, self.black_clock, on_flag=self.scene.time_forfeit)
+        self.scene.clock = self.game_clock
+
         # Dock widget for clock 1
         self.clock1_dock_widget = QDockWidget(self)
-        self.clock1_dock_widget.setWidget(Clock())
+        self.clock1_dock_widget.setWidget(self.white_clock)
         self.clock1_dock_widget.setAllowedAreas(Qt.RightDockWidgetArea)
         self.addDockWidget(Qt.RightDockWidgetArea, self.clock1_dock_widget)
 
         # Dock widget for clock 2
         self.clock2_dock_widget = QDockWidget(self)
-        self.clock2_dock_widget.setWidget(Clock())
+        self.clock2_dock_widget.setWidget(self.black_clock)
         self.clock2_dock_widget.setAllowedAreas(Qt.RightDockWidgetArea)
         self.addDockWidget(Qt.RightDockWidgetArea, self.clock2_dock_widget)
 
@@ -64,6 +77,14 @@ class Window(QMainWindow):
         self.text_field.setGeometry(20, 20, 200, 30)
         self.text_field.returnPressed.connect(self.handle_notation_move)
 
+        # Buttons to take back and replay moves
+        self.undo_button = QPushButton("Undo", self)
+        self.undo_button.setGeometry(230, 20, 80, 30)
+        self.undo_button.clicked.connect(self.scene.undo_move)
+        self.redo_button = QPushButton("Redo", self)
+        self.redo_button.setGeometry(320, 20, 80, 30)
+        self.redo_button.clicked.connect(self.scene.redo_move)
+
         # Set central widget and dock widgets
         self.setCentralWidget(self.chess_dock_widget)
         self.addDockWidget(Qt.LeftDockWidgetArea, self.chess_dock_widget)
@@ -73,64 +94,51 @@ class Window(QMainWindow):
         self.setMinimumSize(1200, 600)
         self.show()
 
-    def handle_notation_move(self):
+    def closeEvent(self, event):
         """
-        Handle chess move input in algebraic notation.
-
-        - Parse the input notation and update the chess board.
+        Save the game and stop the engine process when the window closes.
 
         """
-        notation = self.text_field.text()
-        x, y, fig = self.convert_notation_to_coord(notation)
-        self.scene.update_board(x, y, fig)
+        if self.pgn_path and self.scene.game.moves:
+            self.scene.save_pgn(self.pgn_path)
+        self.scene.close_worker()
+        super().closeEvent(event)
 
-    def convert_notation_to_coord(self, notation):
+    def handle_notation_move(self):
         """
-        Convert algebraic notation to board coordinates.
-
-        Parameters:
-        - notation (str): Algebraic chess move notation (e.g., 'd4').
+        Handle chess move input in algebraic notation.
 
-        Returns:
-        - Tuple (int, int, str): X-coordinate, Y-coordinate, and chess piece type.
+        - Play the move typed in the text field (SAN or LAN, English or Polish
+          piece letters) and clear the field, or print why it was rejected.
 
         """
-        # Check if notation has the correct length
-        if len(notation) < 2:
-            raise ValueError("Invalid chess notation")
-
-        # Get character values from notation
-        letter = notation[-2].lower()
-        number = int(notation[-1])
-        figura = notation[:-2]
-
-        if len(figura):
-            fig = figura[0]
-            if fig == 'K':
-                fig = 'King'
-            elif fig == 'H':
-                fig = 'Queen'
-            elif fig == 'S':
-                fig = 'Knight'
-            elif fig == 'G':
-                fig = 'Bishop'
-            elif fig == 'W':
-                fig = 'Rook'
-            else:
-                raise ValueError("Invalid chess notation")
-        else:
-            fig = 'Pawn'
-
-        # Check if values are within range
-        if letter < 'a' or letter > 'h' or number < 1 or number > 8:
-            raise ValueError("Invalid chess notation")
-
-        # Convert values to coordinates
-        x = ord(letter) - ord('a')
-        y = 8 - number
-        return x * 120, y * 120, fig
+        notation = self.text_field.text()
+        try:
+            self.scene.play_notation(notation)
+        except ValueError as error:
+            print(error)
+            return
+        self.text_field.clear()
 
 if __name__ == '__main__':
-    app = QApplication(sys.argv)
+    parser = argparse.ArgumentParser(description="Chess game.")
+    parser.add_argument('--engine', choices=COLOR_NAMES, help="colour played by the computer")
+    parser.add_argument('--engine-time', type=float, default=1.0, help="seconds the computer thinks per move (default 1)")
+    parser.add_argument('--pgn', help="PGN file the game is appended to when the window closes")
+    parser.add_argument('--analyse', action='store_true', help="analyse the position continuously while the player thinks")
+    parser.add_argument('--time', type=float, default=5, help="minutes on each clock (default 5)")
+    parser.add_argument('--increment', type=float, default=0, help="seconds of increment or delay per move (default 0)")
+    parser.add_argument('--increment-mode', choices=INCREMENT_MODES, default='fischer',
+                        help="fischer adds the increment after each move, bronstein adds at most the time the move "
+                             "took, delay waits that long before the clock counts (default fischer)")
+    args, qt_args = parser.parse_known_args()
+    app = QApplication(sys.argv[:1] + qt_args)
     window = Window()
+    window.game_clock.set_time_control(args.time * 60 * 1000, args.increment * 1000, args.increment_mode)
+    window.game_clock.switch(window.scene.position.turn)
+    if args.engine:
+        window.scene.engine_color = COLOR_NAMES.index(args.engine)
+        window.scene.engine_time = args.engine_time
+    window.scene.set_analysing(args.analyse)
+    window.pgn_path = args.pgn
     sys.exit(app.exec_())  # Start the main event loop
\ No newline at end of file
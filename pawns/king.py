@@ -1,7 +1,7 @@
-from PyQt5.QtCore import QRectF, Qt, QPoint
-from PyQt5.QtGui import QColor, QTransform, QPixmap, QCursor
+from PyQt5.QtCore import QRectF, Qt
+from PyQt5.QtGui import QColor, QCursor
 from PyQt5.QtWidgets import QGraphicsItem, QMenu, QAction
-from pawns.square import Square
+from pawns.pixmaps import piece_pixmap
 
 class King(QGraphicsItem):
     """
@@ -13,21 +13,13 @@ class King(QGraphicsItem):
     - size (int): Size of the king chess piece.
     - color (str): Color of the king ('white' or 'black').
     - image (QPixmap): Image of the king.
-    - possible_move (list): List of possible moves for the king.
-    - buffx, buffy (int): Buffers for the king's position.
-    - removed_item (QGraphicsItem): Item removed from the board during the move.
 
     Methods:
     - boundingRect(): Return the bounding rectangle of the king.
     - paint(painter, option, widget): Paint the king on the board.
     - mousePressEvent(event): Handle mouse press events for the king.
     - is_valid_move(x, y): Check if the move to the given coordinates is valid.
-    - is_valid_move2(x, y): Additional check for move validity.
-    - check(x, y): Check if the king is in check at the given coordinates.
-    - collides_with_opponent(x, y): Check if the king collides with an opponent at the given coordinates.
-    - remove_opponent(x, y): Remove opponent's piece from the board at the given coordinates.
     - mouseReleaseEvent(event): Handle mouse release events for the king.
-    - possible(x, y): Check if the move to the given coordinates is in the list of possible moves.
     - move(x, y): Move the king to the specified coordinates.
     - check_possible(): Check and highlight possible moves for the king.
     - uncheck_possible(): Remove highlights from possible moves.
@@ -52,11 +44,7 @@ class King(QGraphicsItem):
         self.size = size
         self.color = color
         self.setFlag(QGraphicsItem.ItemIsSelectable)
-        self.image = QPixmap(image_path).scaled(self.size, self.size)
-        self.possible_move = []
-        self.buffx = x
-        self.buffy = y
-        self.removed_item = 0
+        self.image = piece_pixmap(image_path, self.size)
 
     def boundingRect(self):
         """
@@ -100,53 +88,8 @@ class King(QGraphicsItem):
         """
         Check if the move to the given coordinates is valid.
 
-        Parameters:
-        - x (int): Target x-coordinate for the move.
-        - y (int): Target y-coordinate for the move.
-
-        Returns:
-        - bool: True if the move is valid, False otherwise.
-
-        """
-        # Check if coordinates are within the board boundaries
-        if x < 0 or x > 960 or y < 0 or y > 960:
-            return False
-
-        dx = x - self.x
-        dy = y - self.y
-
-        # Check valid moves based on the current turn and color
-        if self.scene().current_turn == 'white':
-            if self.color == 'white':
-                # Valid moves for white king
-                if abs(dy) / 120 == 1 and dx == 0:
-                    if self.collides_with_opponent(x, y):
-                        return True
-                if abs(dx) / 120 == 1 and dy == 0:
-                    if self.collides_with_opponent(x, y):
-                        return True
-                if (abs(dy) / 120) == (abs(dx) / 120) == 1:
-                    if self.collides_with_opponent(x, y):
-                        return True
-
-        if self.scene().current_turn == 'black':
-            if self.color == 'black':
-                # Valid moves for black king
-                if abs(dy) / 120 == 1 and dx == 0:
-                    if self.collides_with_opponent(x, y):
-                        return True
-                if abs(dx) / 120 == 1 and dy == 0:
-                    if self.collides_with_opponent(x, y):
-                        return True
-                if (abs(dy) / 120) == (abs(dx) / 120) == 1:
-                    if self.collides_with_opponent(x, y):
-                        return True
-
-        return False
-
-    def is_valid_move2(self, x, y):
-        """
-        Additional check for move validity.
+        Moves onto attacked squares and castling through check are rejected
+        by the board's position.
 
         Parameters:
         - x (int): Target x-coordinate for the move.
@@ -156,97 +99,7 @@ class King(QGraphicsItem):
         - bool: True if the move is valid, False otherwise.
 
         """
-        # Check if coordinates are within the board boundaries
-        if x < 0 or x > 960 or y < 0 or y > 960:
-            return False
-
-        dx = x - self.x
-        dy = y - self.y
-
-        if self.color == 'white':
-            # Additional check for white king's move validity
-            if abs(dy) / 120 == 1 and dx == 0:
-                if self.collides_with_opponent(x, y):
-                    return True
-            if abs(dx) / 120 == 1 and dy == 0:
-                if self.collides_with_opponent(x, y):
-                    return True
-            if (abs(dy) / 120) == (abs(dx) / 120) == 1:
-                if self.collides_with_opponent(x, y):
-                    return True
-
-        if self.color == 'black':
-            # Additional check for black king's move validity
-            if abs(dy) / 120 == 1 and dx == 0:
-                if self.collides_with_opponent(x, y):
-                    return True
-            if abs(dx) / 120 == 1 and dy == 0:
-                if self.collides_with_opponent(x, y):
-                    return True
-            if (abs(dy) / 120) == (abs(dx) / 120) == 1:
-                if self.collides_with_opponent(x, y):
-                    return True
-
-        return False
-
-    def check(self, x, y):
-        """
-        Check if the king is in check at the given coordinates.
-
-        Parameters:
-        - x (int): Target x-coordinate for the check.
-        - y (int): Target y-coordinate for the check.
-
-        Returns:
-        - bool: True if the king is in check, False otherwise.
-
-        """
-        for item in self.scene().items():
-            if not isinstance(item, Square) and item.color != self.color:
-                if item.is_valid_move2(x, y):
-                    return True
-        return False
-
-    def collides_with_opponent(self, x, y):
-        """
-        Check if the king collides with an opponent at the given coordinates.
-
-        Parameters:
-        - x (int): Target x-coordinate for collision check.
-        - y (int): Target y-coordinate for collision check.
-
-        Returns:
-        - bool: True if the king collides with an opponent, False otherwise.
-
-        """
-        for item in self.scene().items():
-            if not isinstance(item, Square) and item.color != self.color and item.x == x and item.y == y:
-                return True
-            if not isinstance(item, Square) and item.color == self.color and item.x == x and item.y == y:
-                return False
-        return True
-
-    def remove_opponent(self, x, y):
-        """
-        Remove opponent's piece from the board at the given coordinates.
-
-        Parameters:
-        - x (int): Target x-coordinate for removal.
-        - y (int): Target y-coordinate for removal.
-
-        Returns:
-        - bool: True if opponent's piece is removed, False otherwise.
-
-        """
-        for item in self.scene().items():
-            if not isinstance(item, Square) and item.color != self.color and item.x == x and item.y == y:
-                self.removed_item = item
-                self.scene().removeItem(item)
-                return True
-            if not isinstance(item, Square) and item.color == self.color and item.x == x and item.y == y:
-                self.removed_item = 0
-                return False
-        return True
+        return self.scene().is_valid_move(self, x, y)
 
     def mouseReleaseEvent(self, event):
         """
@@ -259,79 +112,17 @@ class King(QGraphicsItem):
         super().mouseReleaseEvent(event)
         if event.button() == Qt.LeftButton:
             if self.isSelected():
-                square = self.scene().itemAt(event.scenePos(), QTransform())
-                if self.possible(square.x, square.y):
-                    self.remove_opponent(square.x, square.y)
-                    x = square.x + self.size / 2
-                    y = square.y + self.size / 2
-                    self.setPos(x - self.size / 2, y - self.size / 2)
-                    self.x = x - self.size / 2
-                    self.y = y - self.size / 2
-
-                    if self.color == 'white':
-                        self.scene().kingwpos = [self.x, self.y]
-                    else:
-                        self.scene().kingbpos = [self.x, self.y]
-
-                    if self.color == 'white':
-                        if self.scene().check_white():
-                            self.setPos(self.buffx, self.buffy)
-                            self.x = self.buffx
-                            self.y = self.buffy
-                            if self.removed_item != 0:
-                                self.scene().addItem(self.removed_item)
-                            self.scene().kingwpos = [self.scene().buffkingwpos[0], self.scene().buffkingwpos[0]]
-                        else:
-                            self.buffx = self.x
-                            self.buffy = self.y
-                            self.scene().buffkingwpos = [self.x, self.y]
-                            if self.scene().current_turn == 'white':
-                                self.scene().current_turn = 'black'
-                            else:
-                                self.scene().current_turn = 'white'
-                    else:
-                        if self.scene().check_black():
-                            self.setPos(self.buffx, self.buffy)
-                            self.x = self.buffx
-                            self.y = self.buffy
-                            if self.removed_item != 0:
-                                self.scene().addItem(self.removed_item)
-                            self.scene().kingbpos = [self.scene().buffkingbpos[0], self.scene().buffkingbpos[0]]
-                        else:
-                            self.buffx = self.x
-                            self.buffy = self.y
-                            self.scene().buffkingbpos = [self.x, self.y]
-                            if self.scene().current_turn == 'white':
-                                self.scene().current_turn = 'black'
-                            else:
-                                self.scene().current_turn = 'white'
-
+                pos = event.scenePos()
+                self.scene().make_move(self, pos.x(), pos.y())
                 self.setSelected(False)
             else:
                 self.setSelected(True)
         elif event.button() == Qt.RightButton:
-            self.scene().removeItem(self)
+            self.scene().remove_piece(self)
         else:
             self.setSelected(False)
         self.uncheck_possible()
 
-    def possible(self, x, y):
-        """
-        Check if the move to the given coordinates is in the list of possible moves.
-
-        Parameters:
-        - x (int): Target x-coordinate for the move.
-        - y (int): Target y-coordinate for the move.
-
-        Returns:
-        - bool: True if the move is possible, False otherwise.
-
-        """
-        for item in self.possible_move:
-            if item.x == x and item.y == y:
-                return True
-        return False
-
     def move(self, x, y):
         """
         Move the king to the specified coordinates.
@@ -341,74 +132,21 @@ class King(QGraphicsItem):
         - y (int): Target y-coordinate for the move.
 
         """
-        square = self.scene().itemAt(QPoint(x, y), QTransform())
-        if self.is_valid_move(square.x, square.y):
-            self.remove_opponent(square.x, square.y)
-            x = square.x + self.size / 2
-            y = square.y + self.size / 2
-            self.setPos(x - self.size / 2, y - self.size / 2)
-            self.x = x - self.size / 2
-            self.y = y - self.size / 2
-            if self.color == 'white':
-                self.scene().kingwpos = [self.x, self.y]
-            else:
-                self.scene().kingbpos = [self.x, self.y]
-
-            if self.color == 'white':
-                if self.scene().check_white():
-                    self.setPos(self.buffx, self.buffy)
-                    self.x = self.buffx
-                    self.y = self.buffy
-                    if self.removed_item != 0:
-                        self.scene().addItem(self.removed_item)
-                    self.scene().kingwpos = [self.scene().buffkingwpos[0], self.scene().buffkingwpos[0]]
-                else:
-                    self.buffx = self.x
-                    self.buffy = self.y
-                    self.scene().buffkingwpos = [self.x, self.y]
-                    if self.scene().current_turn == 'white':
-                        self.scene().current_turn = 'black'
-                    else:
-                        self.scene().current_turn = 'white'
-            else:
-                if self.scene().check_black():
-                    self.setPos(self.buffx, self.buffy)
-                    self.x = self.buffx
-                    self.y = self.buffy
-                    if self.removed_item != 0:
-                        self.scene().addItem(self.removed_item)
-                    self.scene().kingbpos = [self.scene().buffkingbpos[0], self.scene().buffkingbpos[0]]
-                else:
-                    self.buffx = self.x
-                    self.buffy = self.y
-                    self.scene().buffkingbpos = [self.x, self.y]
-                    if self.scene().current_turn == 'white':
-                        self.scene().current_turn = 'black'
-                    else:
-                        self.scene().current_turn = 'white'
+        self.scene().make_move(self, x, y)
 
     def check_possible(self):
         """
         Check and highlight possible moves for the king.
 
         """
-        for item in self.scene().items():
-            if isinstance(item, Square) and self.is_valid_move(item.x, item.y):
-                if not self.check(item.x, item.y):
-                    item.color = QColor(102, 255, 102)
-                    self.possible_move.append(item)
-                    item.update()
+        self.scene().show_moves(self)
 
     def uncheck_possible(self):
         """
         Remove highlights from possible moves.
 
         """
-        self.possible_move = []
-        for item in self.scene().items():
-            if isinstance(item, Square):
-                item.color = item.colorbuff
-                item.update()
+        self.scene().hide_moves()
 
 def update_board(self):
     """
@@ -440,18 +178,10 @@ def set_board_color(color, color2, pawn):
     Set the board colors based on the user's selection.
 
     Parameters:
-    - color (str): Color for squares with pos=0.
-    - color2 (str): Color for squares with pos=1.
+    - color (str): Color of the light squares.
+    - color2 (str): Color of the dark squares.
     - pawn: The QGraphicsItem representing the pawn on the board.
 
     """
     # Set the new colors for the squares on the board
-    for item in pawn.scene().items():
-        if isinstance(item, Square):
-            if item.pos == 0:
-                item.color = QColor(color)
-                item.colorbuff = QColor(color)
-            else:
-                item.color = QColor(color2)
-                item.colorbuff = QColor(color2)
-            item.update()
+    pawn.scene().set_board_color(QColor(color), QColor(color2))
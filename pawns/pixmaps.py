@@ -0,0 +1,66 @@
+from PyQt5.QtCore import QRectF, Qt
+from PyQt5.QtGui import QFont, QPainter, QPixmap, QPixmapCache
+
+
+def piece_pixmap(image_path, size):
+    """
+    Return the image of a piece scaled to a size, decoded once per process.
+
+    Scaled images are kept in the process-wide QPixmapCache under their
+    path and size. QPixmap is implicitly shared, so every item, board, FEN
+    setup and promotion holds a reference to the same image instead of
+    decoding and scaling its own.
+
+    Parameters:
+    - image_path (str): Path to the image file, e.g. ':/wp.png'.
+    - size (int): Width and height of the scaled image.
+
+    Returns:
+    - QPixmap: The scaled image.
+
+    """
+    key = '%s@%d' % (image_path, size)
+    pixmap = QPixmapCache.find(key)
+    if pixmap is None or pixmap.isNull():
+        pixmap = QPixmap(image_path).scaled(size, size)
+        QPixmapCache.insert(key, pixmap)
+    return pixmap
+
+
+
+def board_pixmap(light, dark, size):
+    """
+    Return the empty chessboard, squares and coordinate labels, drawn once per colour scheme and size.
+
+    The board is kept in the QPixmapCache like the piece images, so the
+    scene paints its background with a single drawPixmap instead of
+    painting 64 square items and their labels on every repaint.
+
+    Parameters:
+    - light (QColor): Color of the light squares.
+    - dark (QColor): Color of the dark squares.
+    - size (int): Size of each square.
+
+    Returns:
+    - QPixmap: The board, 8 * size wide and high.
+
+    """
+    key = 'board:%s:%s@%d' % (light.name(), dark.name(), size)
+    pixmap = QPixmapCache.find(key)
+    if pixmap is not None and not pixmap.isNull():
+        return pixmap
+    pixmap = QPixmap(8 * size, 8 * size)
+    painter = QPainter(pixmap)
+    painter.setFont(QFont("Arial", 10, QFont.Bold))
+    for row in range(8):
+        for col in range(8):
+            rect = QRectF(col * size, row * size, size, size)
+            painter.fillRect(rect, light if (row + col) % 2 == 0 else dark)
+            painter.drawRect(rect)
+            if row == 7:
+                painter.drawText(rect.adjusted(5, 5, 0, 0), Qt.AlignLeft | Qt.AlignTop, chr(ord('h') - col))
+            if col == 0:
+                painter.drawText(rect.adjusted(0, 0, -5, -5), Qt.AlignRight | Qt.AlignBottom, str(row + 1))
+    painter.end()
+    QPixmapCache.insert(key, pixmap)
+    return pixmap
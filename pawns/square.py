@@ -1,58 +1,62 @@
-from PyQt5.QtCore import QRectF, Qt
-from PyQt5.QtGui import QBrush, QPen, QFont
+from PyQt5.QtCore import QRectF
+from PyQt5.QtGui import QBrush, QColor
 from PyQt5.QtWidgets import QGraphicsItem
 
-class Square(QGraphicsItem):
+class Highlight(QGraphicsItem):
     """
-    Square class represents a square on the chessboard.
+    Highlight class marks the squares a selected piece may move to.
+
+    One item covers the whole board and sits above the background and below
+    the pieces; showing or hiding the moves of a piece changes its square
+    list and repaints it, instead of recolouring square items one by one.
 
     Attributes:
-    - x (int): X-coordinate of the square.
-    - y (int): Y-coordinate of the square.
-    - size (int): Size of the square.
-    - color (QColor): Color of the square.
-    - colorbuff (QColor): Buffered color of the square.
-    - pos (int): Position identifier for the square (0 or 1).
-    
+    - size (int): Size of each square.
+    - squares (list): Scene (x, y) of the top-left corner of every highlighted square.
+    - brush (QBrush): Brush the highlighted squares are filled with.
+
     Methods:
-    - boundingRect(): Return the bounding rectangle of the square.
-    - paint(painter, option, widget): Paint the square on the chessboard.
+    - boundingRect(): Return the bounding rectangle of the board.
+    - set_squares(squares): Highlight other squares.
+    - paint(painter, option, widget): Paint the highlighted squares.
 
     """
-    def __init__(self, x, y, size, color, pos):
+    def __init__(self, size):
         """
-        Initialize the Square.
+        Initialize the Highlight with no squares.
 
         Parameters:
-        - x (int): X-coordinate of the square.
-        - y (int): Y-coordinate of the square.
-        - size (int): Size of the square.
-        - color (QColor): Color of the square.
-        - pos (int): Position identifier for the square (0 or 1).
+        - size (int): Size of each square.
 
         """
         super().__init__()
-        self.x = x
-        self.y = y
         self.size = size
-        self.color = color
-        self.colorbuff = color
-        self.pos = pos
-        self.setFlag(QGraphicsItem.ItemIsSelectable)
+        self.squares = []
+        self.brush = QBrush(QColor(102, 255, 102))
+        self.setZValue(-1)
 
     def boundingRect(self):
         """
-        Return the bounding rectangle of the square.
+        Return the bounding rectangle of the board.
 
         Returns:
-        - QRectF: Bounding rectangle of the square.
+        - QRectF: Bounding rectangle of the board.
+
+        """
+        return QRectF(0, 0, 8 * self.size, 8 * self.size)
 
+    def set_squares(self, squares):
         """
-        return QRectF(self.x, self.y, self.size, self.size)
+        Highlight other squares, given by the scene (x, y) of their top-left corners.
+
+        """
+        if squares != self.squares:
+            self.squares = squares
+            self.update()
 
     def paint(self, painter, option, widget):
         """
-        Paint the square on the chessboard.
+        Paint the highlighted squares.
 
         Parameters:
         - painter: QPainter object for painting.
@@ -60,23 +64,7 @@ class Square(QGraphicsItem):
         - widget: QWidget being painted on.
 
         """
-        rect = self.boundingRect()
-        brush = QBrush(self.color)
-        pen = QPen(Qt.black)
-        pen.setWidth(2)
-        painter.fillRect(rect, brush)
-        painter.drawRect(rect)
-        font = QFont("Arial", 12, QFont.Bold)
-        painter.setFont(font)
-
-        if self.y == 7 * self.size:
-            font = QFont("Arial", 10, QFont.Bold)
-            painter.setFont(font)
-            col_char = chr(ord('a') + self.x // self.size)
-            painter.drawText(rect.adjusted(5, 5, 0, 0), Qt.AlignLeft | Qt.AlignTop, col_char)
-
-        if self.x == 0:
-            font = QFont("Arial", 10, QFont.Bold)
-            painter.setFont(font)
-            row_num = 8 - self.y // self.size
-            painter.drawText(rect.adjusted(0, 0, -5, -5), Qt.AlignRight | Qt.AlignBottom, str(row_num))
\ No newline at end of file
+        for x, y in self.squares:
+            rect = QRectF(x, y, self.size, self.size)
+            painter.fillRect(rect, self.brush)
+            painter.drawRect(rect)
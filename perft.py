@@ -0,0 +1,142 @@
+import argparse
+import sys
+import time
+from rules.bitboard import move_uci
+from rules.fen import STARTING_FEN, parse_fen
+
+# Reference positions with their known-correct node counts for depth 1, 2, ...
+POSITIONS = (
+    ('start', STARTING_FEN,
+     (20, 400, 8902, 197281, 4865609, 119060324)),
+    ('kiwipete', 'r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1',
+     (48, 2039, 97862, 4085603, 193690690)),
+    ('endgame', '8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1',
+     (14, 191, 2812, 43238, 674624, 11030083)),
+    ('promotions', 'r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1',
+     (6, 264, 9467, 422333, 15833292)),
+    ('talkchess', 'rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8',
+     (44, 1486, 62379, 2103487, 89941194)),
+    ('middlegame', 'r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10',
+     (46, 2079, 89890, 3894594, 164075551)),
+)
+
+
+def perft(pos, depth):
+    """
+    Count the leaf nodes of the legal move tree.
+
+    Parameters:
+    - pos (Position): Position to start from.
+    - depth (int): Number of plies to search.
+
+    Returns:
+    - int: Number of positions reached after exactly depth plies.
+
+    """
+    moves = pos.legal_moves()
+    if depth <= 1:
+        return len(moves) if depth == 1 else 1
+    nodes = 0
+    for move in moves:
+        undo = pos.make_move(move)
+        nodes += perft(pos, depth - 1)
+        pos.unmake_move(undo)
+    return nodes
+
+
+def divide(pos, depth):
+    """
+    Split a perft count per root move.
+
+    Parameters:
+    - pos (Position): Position to start from.
+    - depth (int): Number of plies to search, at least 1.
+
+    Returns:
+    - list: (move, nodes) pairs in generation order.
+
+    """
+    counts = []
+    for move in pos.legal_moves():
+        undo = pos.make_move(move)
+        counts.append((move, perft(pos, depth - 1)))
+        pos.unmake_move(undo)
+    return counts
+
+
+def run(name, fen, depth, expected=None, split=False, out=sys.stdout):
+    """
+    Run perft on one position and print the node count, speed and verdict.
+
+    Parameters:
+    - name (str): Label printed for the position.
+    - fen (str): Position to search.
+    - depth (int): Number of plies to search.
+    - expected (int): Known-correct node count, if any.
+    - split (bool): Also print the count of every root move.
+    - out: Stream to write the report to.
+
+    Returns:
+    - tuple: (ok, nodes), ok being False if the count differs from the expected one.
+
+    """
+    pos = parse_fen(fen)
+    start = time.perf_counter()
+    if split:
+        counts = divide(pos, depth)
+        nodes = sum(count for _, count in counts)
+    else:
+        nodes = perft(pos, depth)
+    elapsed = time.perf_counter() - start
+
+    if split:
+        for move, count in sorted(counts, key=lambda item: move_uci(item[0])):
+            out.write('%s: %d\n' % (move_uci(move), count))
+    verdict = ''
+    if expected is not None:
+        verdict = 'ok' if nodes == expected else 'FAIL (expected %d)' % expected
+    nps = nodes / elapsed if elapsed > 0 else 0.0
+    out.write('%-12s depth %d  nodes %12d  time %8.3fs  nps %10.0f  %s\n' % (name, depth, nodes, elapsed, nps, verdict))
+    return expected is None or nodes == expected, nodes
+
+
+def main(argv=None):
+    """
+    Command-line entry point.
+
+    Runs the reference positions (or a given FEN) to a depth, reporting
+    node counts, nodes per second and mismatches against the known counts.
+    Exits with status 1 if any count is wrong.
+
+    """
+    parser = argparse.ArgumentParser(description="Count move-generation nodes (perft) and measure their speed.")
+    parser.add_argument('-d', '--depth', type=int, default=3, help="plies to search (default 3)")
+    parser.add_argument('-p', '--position', action='append', choices=[name for name, _, _ in POSITIONS],
+                        help="reference position to run (repeatable, default all)")
+    parser.add_argument('-f', '--fen', help="run a custom FEN instead of the reference positions")
+    parser.add_argument('--divide', action='store_true', help="print the node count of every root move")
+    args = parser.parse_args(argv)
+    if args.depth < 1:
+        parser.error("argument -d/--depth: must be at least 1")
+
+    if args.fen:
+        ok, _ = run('fen', args.fen, args.depth, split=args.divide)
+    else:
+        ok = True
+        total_nodes = 0
+        start = time.perf_counter()
+        for name, fen, counts in POSITIONS:
+            if args.position and name not in args.position:
+                continue
+            expected = counts[args.depth - 1] if args.depth <= len(counts) else None
+            passed, nodes = run(name, fen, args.depth, expected, args.divide)
+            ok = ok and passed
+            total_nodes += nodes
+        elapsed = time.perf_counter() - start
+        if total_nodes and elapsed > 0:
+            print('total        nodes %d  time %.3fs  nps %.0f' % (total_nodes, elapsed, total_nodes / elapsed))
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
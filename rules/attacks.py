@@ -0,0 +1,47 @@
+"""
+Precomputed attack tables for the leaping pieces and empty-board lines.
+
+Each table holds one bitboard per square, so the squares a king, knight or
+pawn attacks are a list lookup instead of coordinate arithmetic.
+
+- KNIGHT_ATTACKS[sq]: Squares a knight on sq attacks.
+- KING_ATTACKS[sq]: Squares a king on sq attacks.
+- PAWN_ATTACKS[color][sq]: Squares a pawn of that colour on sq attacks.
+- ROOK_RAYS[sq], BISHOP_RAYS[sq]: Empty-board rook and bishop lines through sq,
+  used to tell whether two squares share a line.
+- BETWEEN[a][b]: Squares strictly between a and b when they share a line, else 0.
+
+Because attacks are symmetric, PAWN_ATTACKS[color ^ 1][sq] & pawns[color]
+gives the pawns of a colour that attack sq.
+
+"""
+
+from rules.bitboard import (
+    WHITE, BLACK, KNIGHT_DELTAS, KING_DELTAS, PAWN_CAPTURE_DELTAS, ROOK_DIRECTIONS, BISHOP_DIRECTIONS,
+    step_attacks, ray_attacks,
+)
+
+KNIGHT_ATTACKS = [step_attacks(sq, KNIGHT_DELTAS) for sq in range(64)]
+KING_ATTACKS = [step_attacks(sq, KING_DELTAS) for sq in range(64)]
+PAWN_ATTACKS = (
+    [step_attacks(sq, PAWN_CAPTURE_DELTAS[WHITE]) for sq in range(64)],
+    [step_attacks(sq, PAWN_CAPTURE_DELTAS[BLACK]) for sq in range(64)],
+)
+ROOK_RAYS = [ray_attacks(sq, 0, ROOK_DIRECTIONS) for sq in range(64)]
+BISHOP_RAYS = [ray_attacks(sq, 0, BISHOP_DIRECTIONS) for sq in range(64)]
+
+
+def _between(a, b):
+    """
+    Return the squares strictly between two squares on a common line.
+
+    """
+    if a == b:
+        return 0
+    directions = ROOK_DIRECTIONS if ROOK_RAYS[a] >> b & 1 else BISHOP_DIRECTIONS if BISHOP_RAYS[a] >> b & 1 else ()
+    if not directions:
+        return 0
+    return ray_attacks(a, 1 << b, directions) & ray_attacks(b, 1 << a, directions)
+
+
+BETWEEN = [[_between(a, b) for b in range(64)] for a in range(64)]
@@ -0,0 +1,201 @@
+"""
+Bitboard constants and helpers shared by the headless rules core.
+
+Squares are numbered 0..63 from a1 to h8 (square = rank * 8 + file), and a
+bitboard is a Python int whose bit n is set when square n is occupied.
+Nothing in this module depends on PyQt5.
+
+Moves are encoded as small ints: from_sq | to_sq << 6 | promotion << 12,
+where promotion is the piece type a pawn turns into (0 for none).
+
+"""
+
+WHITE, BLACK = 0, 1
+PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING = range(6)
+
+COLOR_NAMES = ('white', 'black')
+PIECE_NAMES = ('Pawn', 'Knight', 'Bishop', 'Rook', 'Queen', 'King')
+PIECE_SYMBOLS = 'pnbrqk'
+
+FULL = 0xFFFFFFFFFFFFFFFF
+FILE_A = 0x0101010101010101
+FILE_H = FILE_A << 7
+RANK_1 = 0xFF
+RANK_8 = RANK_1 << 56
+
+KNIGHT_DELTAS = ((1, 2), (2, 1), (2, -1), (1, -2), (-1, -2), (-2, -1), (-2, 1), (-1, 2))
+KING_DELTAS = ((1, 0), (1, 1), (0, 1), (-1, 1), (-1, 0), (-1, -1), (0, -1), (1, -1))
+PAWN_CAPTURE_DELTAS = (((-1, 1), (1, 1)), ((-1, -1), (1, -1)))
+ROOK_DIRECTIONS = ((1, 0), (-1, 0), (0, 1), (0, -1))
+BISHOP_DIRECTIONS = ((1, 1), (-1, 1), (1, -1), (-1, -1))
+
+
+def square(file, rank):
+    """
+    Return the square index for a file and rank (both 0..7).
+
+    """
+    return rank * 8 + file
+
+
+def square_file(sq):
+    """
+    Return the file (0..7) of a square.
+
+    """
+    return sq & 7
+
+
+def square_rank(sq):
+    """
+    Return the rank (0..7) of a square.
+
+    """
+    return sq >> 3
+
+
+def square_name(sq):
+    """
+    Return the algebraic name of a square, e.g. 'e4'.
+
+    """
+    return 'abcdefgh'[sq & 7] + str((sq >> 3) + 1)
+
+
+def parse_square(name):
+    """
+    Convert an algebraic square name such as 'e4' into a square index.
+
+    Raises:
+    - ValueError: If the name is not a valid square.
+
+    """
+    if len(name) != 2 or name[0] not in 'abcdefgh' or name[1] not in '12345678':
+        raise ValueError("Invalid square: %r" % name)
+    return square(ord(name[0]) - ord('a'), int(name[1]) - 1)
+
+
+def lsb(bb):
+    """
+    Return the index of the least significant set bit of a non-empty bitboard.
+
+    """
+    return (bb & -bb).bit_length() - 1
+
+
+def iter_bits(bb):
+    """
+    Yield the square index of every set bit, lowest first.
+
+    """
+    while bb:
+        low = bb & -bb
+        yield low.bit_length() - 1
+        bb ^= low
+
+
+def popcount(bb):
+    """
+    Return the number of set bits in a bitboard.
+
+    """
+    return bin(bb).count('1')
+
+
+def step_attacks(sq, deltas):
+    """
+    Return the squares reached from sq by a single (file, rank) step.
+
+    Parameters:
+    - sq (int): Origin square.
+    - deltas (tuple): Sequence of (file, rank) offsets.
+
+    Returns:
+    - int: Bitboard of the reachable squares that lie on the board.
+
+    """
+    file, rank = sq & 7, sq >> 3
+    bb = 0
+    for df, dr in deltas:
+        f, r = file + df, rank + dr
+        if 0 <= f < 8 and 0 <= r < 8:
+            bb |= 1 << (r * 8 + f)
+    return bb
+
+
+def ray_attacks(sq, occupied, directions):
+    """
+    Return sliding attacks from sq, stopping at the first blocker on each ray.
+
+    Parameters:
+    - sq (int): Origin square.
+    - occupied (int): Bitboard of all blocking pieces.
+    - directions (tuple): Sequence of (file, rank) ray directions.
+
+    Returns:
+    - int: Bitboard of attacked squares, blockers included.
+
+    """
+    file, rank = sq & 7, sq >> 3
+    bb = 0
+    for df, dr in directions:
+        f, r = file + df, rank + dr
+        while 0 <= f < 8 and 0 <= r < 8:
+            target = 1 << (r * 8 + f)
+            bb |= target
+            if occupied & target:
+                break
+            f += df
+            r += dr
+    return bb
+
+
+def encode_move(from_sq, to_sq, promotion=0):
+    """
+    Pack a move into an int.
+
+    Parameters:
+    - from_sq (int): Origin square.
+    - to_sq (int): Target square.
+    - promotion (int): Piece type a pawn promotes to, 0 for none.
+
+    Returns:
+    - int: Encoded move.
+
+    """
+    return from_sq | to_sq << 6 | promotion << 12
+
+
+def move_from(move):
+    """
+    Return the origin square of an encoded move.
+
+    """
+    return move & 63
+
+
+def move_to(move):
+    """
+    Return the target square of an encoded move.
+
+    """
+    return (move >> 6) & 63
+
+
+def move_promotion(move):
+    """
+    Return the promotion piece type of an encoded move (0 for none).
+
+    """
+    return move >> 12
+
+
+def move_uci(move):
+    """
+    Return the long algebraic (UCI) form of a move, e.g. 'e7e8q'.
+
+    """
+    text = square_name(move & 63) + square_name((move >> 6) & 63)
+    if move >> 12:
+        text += PIECE_SYMBOLS[move >> 12]
+    return text
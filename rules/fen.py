@@ -0,0 +1,111 @@
+"""
+FEN (Forsyth-Edwards Notation) parsing and serialisation for Position.
+
+Functions:
+- parse_fen(fen): Build a Position from a FEN string.
+- to_fen(position): Serialise a Position to a FEN string.
+
+"""
+
+from rules.bitboard import WHITE, BLACK, PAWN, KING, PIECE_SYMBOLS, RANK_1, RANK_8, square, parse_square, square_name, popcount
+from rules.position import Position, CASTLE_WHITE_KING, CASTLE_WHITE_QUEEN, CASTLE_BLACK_KING, CASTLE_BLACK_QUEEN
+
+STARTING_FEN = 'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1'
+
+CASTLING_SYMBOLS = (('K', CASTLE_WHITE_KING), ('Q', CASTLE_WHITE_QUEEN),
+                    ('k', CASTLE_BLACK_KING), ('q', CASTLE_BLACK_QUEEN))
+
+
+def parse_fen(fen):
+    """
+    Build a Position from a FEN string.
+
+    The move counters may be omitted, as in EPD records.
+
+    Parameters:
+    - fen (str): Position in Forsyth-Edwards Notation.
+
+    Returns:
+    - Position: The parsed position.
+
+    Raises:
+    - ValueError: If the string is not a valid FEN, a side has no king or
+      several, or a pawn stands on the first or last rank.
+
+    """
+    fields = fen.split()
+    if len(fields) < 4:
+        raise ValueError("Invalid FEN: %r" % fen)
+    rows = fields[0].split('/')
+    if len(rows) != 8:
+        raise ValueError("Invalid FEN board: %r" % fields[0])
+
+    pos = Position()
+    for index, row in enumerate(rows):
+        rank = 7 - index
+        file = 0
+        for char in row:
+            if char.isdigit():
+                file += int(char)
+            elif char.lower() in PIECE_SYMBOLS and file < 8:
+                color = WHITE if char.isupper() else BLACK
+                pos.put_piece(square(file, rank), color, PIECE_SYMBOLS.index(char.lower()))
+                file += 1
+            else:
+                raise ValueError("Invalid FEN board: %r" % fields[0])
+        if file != 8:
+            raise ValueError("Invalid FEN board: %r" % fields[0])
+    # Move generation assumes one king a side and no pawn on the back ranks
+    if any(popcount(pos.pieces[color][KING]) != 1 for color in (WHITE, BLACK)):
+        raise ValueError("Invalid FEN board, each side needs one king: %r" % fields[0])
+    if (pos.pieces[WHITE][PAWN] | pos.pieces[BLACK][PAWN]) & (RANK_1 | RANK_8):
+        raise ValueError("Invalid FEN board, pawn on the first or last rank: %r" % fields[0])
+
+    if fields[1] not in ('w', 'b'):
+        raise ValueError("Invalid FEN side to move: %r" % fields[1])
+    pos.turn = WHITE if fields[1] == 'w' else BLACK
+    for symbol, right in CASTLING_SYMBOLS:
+        if symbol in fields[2]:
+            pos.castling |= right
+    pos.ep_square = None if fields[3] == '-' else parse_square(fields[3])
+    if len(fields) > 4:
+        pos.halfmove_clock = int(fields[4])
+    if len(fields) > 5:
+        pos.fullmove_number = int(fields[5])
+    pos.update_checkers()
+    pos.update_hash()
+    return pos
+
+
+def to_fen(pos):
+    """
+    Serialise a Position to a FEN string.
+
+    Parameters:
+    - pos (Position): Position to serialise.
+
+    Returns:
+    - str: Position in Forsyth-Edwards Notation.
+
+    """
+    rows = []
+    for rank in range(7, -1, -1):
+        row = ''
+        empty = 0
+        for file in range(8):
+            piece = pos.piece_at(square(file, rank))
+            if piece is None:
+                empty += 1
+                continue
+            if empty:
+                row += str(empty)
+                empty = 0
+            symbol = PIECE_SYMBOLS[piece[1]]
+            row += symbol.upper() if piece[0] == WHITE else symbol
+        if empty:
+            row += str(empty)
+        rows.append(row)
+    castling = ''.join(symbol for symbol, right in CASTLING_SYMBOLS if pos.castling & right) or '-'
+    ep_square = '-' if pos.ep_square is None else square_name(pos.ep_square)
+    return '%s %s %s %s %d %d' % ('/'.join(rows), 'w' if pos.turn == WHITE else 'b', castling,
+                                  ep_square, pos.halfmove_clock, pos.fullmove_number)
@@ -0,0 +1,309 @@
+"""
+Streaming PGN (Portable Game Notation) reader and writer.
+
+read_games() is a generator that reads one line at a time and holds only
+the current game, so archives of any size are imported in constant memory.
+Tag pairs, SAN movetext, brace and semicolon comments, NAGs, escape lines
+and nested variations are understood; comments and variations are skipped.
+Moves are replayed on a Position, so every imported game is checked for
+legality and ends up as encoded moves.
+
+Run `python -m rules.pgn FILE...` to measure the import speed.
+
+"""
+
+import argparse
+import re
+import sys
+import time
+from rules.bitboard import WHITE
+from rules.fen import STARTING_FEN, parse_fen, to_fen
+from rules.position import Position
+from rules.san import parse_san, move_to_san
+
+RESULTS = ('1-0', '0-1', '1/2-1/2', '*')
+
+# Tags written first, in this order, as the PGN standard asks
+SEVEN_TAG_ROSTER = ('Event', 'Site', 'Date', 'Round', 'White', 'Black', 'Result')
+
+TAG_PATTERN = re.compile(r'^\[\s*(\w+)\s+"((?:[^"\\]|\\.)*)"\s*\]')
+TOKEN_PATTERN = re.compile(r'[{};()]|\$\d+|[^\s{};()$]+')
+MOVE_NUMBER_PATTERN = re.compile(r'^\d+\.*')
+
+
+class Game:
+    """
+    Game class holds one game: its tags, moves and result.
+
+    Attributes:
+    - headers (dict): Tag pairs in file order.
+    - moves (list): Encoded moves from the starting position.
+    - result (str): '1-0', '0-1', '1/2-1/2' or '*'.
+    - error (str): Why the moves stopped being read, or None.
+
+    Methods:
+    - starting_position(): Return the position the game starts from.
+    - end_position(): Return the position after the last move.
+
+    """
+
+    def __init__(self, headers=None, moves=None, result='*'):
+        """
+        Initialize a game.
+
+        """
+        self.headers = {} if headers is None else headers
+        self.moves = [] if moves is None else moves
+        self.result = result
+        self.error = None
+
+    def starting_position(self):
+        """
+        Return the position the game starts from, given by the FEN tag if present.
+
+        Raises:
+        - ValueError: If the FEN tag is not a valid FEN.
+
+        """
+        if 'FEN' in self.headers:
+            return parse_fen(self.headers['FEN'])
+        return Position.initial()
+
+    def end_position(self):
+        """
+        Return the position after the last move.
+
+        """
+        pos = self.starting_position()
+        for move in self.moves:
+            pos.make_move(move)
+        return pos
+
+
+def game_result(pos):
+    """
+    Return the result of a game that ended in a position.
+
+    Returns:
+    - str: '1-0' or '0-1' for checkmate, '1/2-1/2' for stalemate, threefold
+      repetition or the fifty-move rule, else '*'.
+
+    """
+    if pos.legal_moves():
+        return '1/2-1/2' if pos.repetitions() >= 2 or pos.halfmove_clock >= 100 else '*'
+    if pos.checkers:
+        return '0-1' if pos.turn == WHITE else '1-0'
+    return '1/2-1/2'
+
+
+def read_games(stream, parse_moves=True):
+    """
+    Read games from a PGN stream, one at a time.
+
+    A game whose movetext has an illegal or unreadable move keeps the
+    moves before it and records the problem in its error attribute.
+
+    Parameters:
+    - stream: Text stream, e.g. an open file.
+    - parse_moves (bool): Replay the moves; when False only the tags and
+      result are read, which is much faster.
+
+    Yields:
+    - Game: Each game in the stream.
+
+    """
+    game = None
+    pos = None
+    in_comment = False
+    depth = 0
+    movetext = False
+    for line in stream:
+        if not in_comment:
+            if line.startswith('%'):
+                continue
+            stripped = line.strip()
+            if not stripped:
+                continue
+            if stripped.startswith('[') and depth == 0:
+                if movetext:
+                    yield game
+                    game = None
+                    movetext = False
+                if game is None:
+                    game = Game()
+                match = TAG_PATTERN.match(stripped)
+                if match:
+                    game.headers[match.group(1)] = match.group(2).replace('\\"', '"').replace('\\\\', '\\')
+                continue
+        if game is None:
+            game = Game()
+        if not movetext:
+            movetext = True
+            pos = _start_movetext(game, parse_moves)
+
+        for token in TOKEN_PATTERN.findall(line):
+            if in_comment:
+                if token == '}':
+                    in_comment = False
+                continue
+            if token == '{':
+                in_comment = True
+            elif token == ';':
+                break
+            elif token == '(':
+                depth += 1
+            elif token == ')':
+                depth = max(0, depth - 1)
+            elif depth or token[0] == '$':
+                continue
+            else:
+                if game is None:
+                    # Movetext of the next game on the line that ended the last one
+                    game = Game()
+                    movetext = True
+                    pos = _start_movetext(game, parse_moves)
+                if token in RESULTS:
+                    game.result = token
+                    yield game
+                    game = None
+                    pos = None
+                    movetext = False
+                    continue
+                token = MOVE_NUMBER_PATTERN.sub('', token)
+                if not token or pos is None:
+                    continue
+                try:
+                    move = parse_san(pos, token)
+                except ValueError as error:
+                    game.error = str(error)
+                    pos = None
+                    continue
+                pos.make_move(move)
+                game.moves.append(move)
+    if game is not None:
+        yield game
+
+
+def _start_movetext(game, parse_moves):
+    """
+    Return the position a game's moves are replayed on, or None when they are not replayed.
+
+    An invalid FEN tag is recorded in the game's error attribute.
+
+    """
+    if not parse_moves:
+        return None
+    try:
+        return game.starting_position()
+    except ValueError as error:
+        game.error = str(error)
+        return None
+
+
+def write_game(out, game, width=79, comments=None):
+    """
+    Write a game in PGN: the seven tag roster, other tags, then SAN movetext.
+
+    Parameters:
+    - out: Text stream to write to.
+    - game (Game): Game to write.
+    - width (int): Longest movetext line.
+    - comments (list): Comment to write after each move, None for no comment.
+
+    """
+    headers = dict(game.headers)
+    headers['Result'] = game.result
+    for name in SEVEN_TAG_ROSTER:
+        out.write('[%s "%s"]\n' % (name, _escape(headers.pop(name, '?'))))
+    for name, value in headers.items():
+        out.write('[%s "%s"]\n' % (name, _escape(value)))
+    out.write('\n')
+
+    try:
+        pos = game.starting_position()
+    except ValueError:
+        # read_games keeps no moves of a game whose FEN tag is invalid
+        moves = []
+    else:
+        moves = game.moves
+    tokens = []
+    commented = False
+    for index, move in enumerate(moves):
+        if pos.turn == WHITE:
+            tokens.append('%d.' % pos.fullmove_number)
+        elif index == 0 or commented:
+            tokens.append('%d...' % pos.fullmove_number)
+        tokens.append(move_to_san(pos, move))
+        pos.make_move(move)
+        commented = bool(comments and index < len(comments) and comments[index])
+        if commented:
+            tokens.append('{%s}' % comments[index].replace('}', ')'))
+    tokens.append(game.result)
+
+    line = ''
+    for token in tokens:
+        if line and len(line) + 1 + len(token) > width:
+            out.write(line + '\n')
+            line = token
+        else:
+            line = line + ' ' + token if line else token
+    out.write(line + '\n\n')
+
+
+def _escape(value):
+    """
+    Escape backslashes and quotes in a tag value.
+
+    """
+    return value.replace('\\', '\\\\').replace('"', '\\"')
+
+
+def start_game(pos=None, **headers):
+    """
+    Create a game to be recorded, starting from a position.
+
+    Parameters:
+    - pos (Position): Starting position; the standard one when None.
+    - headers: Extra tag pairs, e.g. White='Alice'.
+
+    Returns:
+    - Game: Empty game with a FEN tag when the start is not standard.
+
+    """
+    game = Game(dict(headers))
+    game.headers.setdefault('Date', time.strftime('%Y.%m.%d'))
+    if pos is not None:
+        fen = to_fen(pos)
+        if fen != STARTING_FEN:
+            game.headers['SetUp'] = '1'
+            game.headers['FEN'] = fen
+    return game
+
+
+def main(argv=None):
+    """
+    Command-line entry point: import PGN files and report the speed.
+
+    """
+    parser = argparse.ArgumentParser(description="Import PGN files and measure games per minute.")
+    parser.add_argument('files', nargs='+', help="PGN files to read")
+    parser.add_argument('--tags-only', action='store_true', help="read tags and results without replaying moves")
+    args = parser.parse_args(argv)
+
+    games = plies = errors = 0
+    start = time.perf_counter()
+    for path in args.files:
+        with open(path, encoding='utf-8', errors='replace') as stream:
+            for game in read_games(stream, not args.tags_only):
+                games += 1
+                plies += len(game.moves)
+                if game.error:
+                    errors += 1
+    elapsed = time.perf_counter() - start
+    rate = games * 60 / elapsed if elapsed > 0 else 0.0
+    print('games %d  plies %d  errors %d  time %.3fs  games/min %.0f' % (games, plies, errors, elapsed, rate))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
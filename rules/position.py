@@ -0,0 +1,644 @@
+from rules.bitboard import (
+    WHITE, BLACK, PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING, FULL,
+    square, square_rank, lsb, iter_bits,
+    encode_move, move_from, move_to, move_promotion,
+)
+from rules.attacks import KNIGHT_ATTACKS, KING_ATTACKS, PAWN_ATTACKS, ROOK_RAYS, BISHOP_RAYS, BETWEEN
+from rules.magic import rook_attacks, bishop_attacks, queen_attacks
+from rules.zobrist import PIECE_KEYS, CASTLING_KEYS, TURN_KEY, ep_key, compute_hash
+
+CASTLE_WHITE_KING = 1
+CASTLE_WHITE_QUEEN = 2
+CASTLE_BLACK_KING = 4
+CASTLE_BLACK_QUEEN = 8
+
+# (color, right, king from, king to, rook from, rook to, squares that must be empty, squares the king crosses)
+CASTLING_MOVES = (
+    (WHITE, CASTLE_WHITE_KING, 4, 6, 7, 5, 0x60, (4, 5, 6)),
+    (WHITE, CASTLE_WHITE_QUEEN, 4, 2, 0, 3, 0x0E, (4, 3, 2)),
+    (BLACK, CASTLE_BLACK_KING, 60, 62, 63, 61, 0x60 << 56, (60, 61, 62)),
+    (BLACK, CASTLE_BLACK_QUEEN, 60, 58, 56, 59, 0x0E << 56, (60, 59, 58)),
+)
+
+# Rook squares for a castling move, keyed by the king's target square
+CASTLING_ROOKS = {6: (7, 5), 2: (0, 3), 62: (63, 61), 58: (56, 59)}
+
+# Castling rights kept when a move starts or ends on a square
+CASTLING_MASK = [15] * 64
+CASTLING_MASK[0] = 15 & ~CASTLE_WHITE_QUEEN
+CASTLING_MASK[4] = 15 & ~(CASTLE_WHITE_KING | CASTLE_WHITE_QUEEN)
+CASTLING_MASK[7] = 15 & ~CASTLE_WHITE_KING
+CASTLING_MASK[56] = 15 & ~CASTLE_BLACK_QUEEN
+CASTLING_MASK[60] = 15 & ~(CASTLE_BLACK_KING | CASTLE_BLACK_QUEEN)
+CASTLING_MASK[63] = 15 & ~CASTLE_BLACK_KING
+
+PROMOTIONS = (QUEEN, ROOK, BISHOP, KNIGHT)
+
+
+class Position:
+    """
+    Position class is the headless model of a chess position.
+
+    Attributes:
+    - pieces (list): pieces[color][piece_type] bitboards.
+    - occupied (list): occupied[color] bitboards of all pieces of a colour.
+    - board (list): Mailbox of 64 entries, (color, piece_type) or None.
+    - turn (int): Side to move (WHITE or BLACK).
+    - castling (int): Castling rights as a mask of the CASTLE_* flags.
+    - ep_square (int): Square a pawn may capture en passant onto, or None.
+    - halfmove_clock (int): Plies since the last capture or pawn move.
+    - fullmove_number (int): Move number, incremented after black moves.
+    - checkers (int): Bitboard of pieces giving check to the side to move.
+    - hash (int): Zobrist hash, kept up to date by every change to the position.
+    - history (list): Hashes of the positions before each move played, oldest first.
+
+    Methods:
+    - initial(): Create the standard starting position.
+    - copy(): Return an independent copy of the position.
+    - update_hash(): Recompute the hash from scratch.
+    - put_piece(sq, color, piece_type): Place a piece on a square.
+    - remove_piece(sq): Remove and return the piece on a square.
+    - piece_at(sq): Return the piece on a square.
+    - king_square(color): Return the square of a king.
+    - attacks_from(sq): Return the squares attacked by the piece on a square.
+    - attackers(sq, color): Return the pieces of a colour attacking a square.
+    - is_attacked(sq, color): Check if a colour attacks a square.
+    - in_check(color): Check if a king is in check.
+    - update_checkers(): Recompute the checkers from scratch.
+    - legal_moves(from_sq): Generate legal moves using pin and check masks.
+    - find_move(from_sq, to_sq, promotion): Find the legal move between two squares.
+    - captured_square(move): Return the square of the piece a move captures.
+    - castling_rook(move): Return the rook squares of a castling move.
+    - repetitions(): Count the earlier occurrences of the position.
+    - make_move(move): Play a move on the position and return its undo record.
+    - unmake_move(undo): Take back the last move played.
+
+    """
+
+    def __init__(self):
+        """
+        Initialize an empty position with white to move.
+
+        """
+        self.pieces = [[0] * 6, [0] * 6]
+        self.occupied = [0, 0]
+        self.board = [None] * 64
+        self.turn = WHITE
+        self.castling = 0
+        self.ep_square = None
+        self.halfmove_clock = 0
+        self.fullmove_number = 1
+        self.checkers = 0
+        self.hash = 0
+        self.history = []
+
+    @classmethod
+    def initial(cls):
+        """
+        Create the standard starting position.
+
+        Returns:
+        - Position: Position with all pieces on their home squares.
+
+        """
+        pos = cls()
+        order = (ROOK, KNIGHT, BISHOP, QUEEN, KING, BISHOP, KNIGHT, ROOK)
+        for file, piece_type in enumerate(order):
+            pos.put_piece(square(file, 0), WHITE, piece_type)
+            pos.put_piece(square(file, 1), WHITE, PAWN)
+            pos.put_piece(square(file, 6), BLACK, PAWN)
+            pos.put_piece(square(file, 7), BLACK, piece_type)
+        pos.castling = CASTLE_WHITE_KING | CASTLE_WHITE_QUEEN | CASTLE_BLACK_KING | CASTLE_BLACK_QUEEN
+        pos.update_checkers()
+        pos.update_hash()
+        return pos
+
+    def copy(self):
+        """
+        Return an independent copy of the position.
+
+        """
+        pos = Position.__new__(Position)
+        pos.pieces = [self.pieces[WHITE][:], self.pieces[BLACK][:]]
+        pos.occupied = self.occupied[:]
+        pos.board = self.board[:]
+        pos.turn = self.turn
+        pos.castling = self.castling
+        pos.ep_square = self.ep_square
+        pos.halfmove_clock = self.halfmove_clock
+        pos.fullmove_number = self.fullmove_number
+        pos.checkers = self.checkers
+        pos.hash = self.hash
+        pos.history = self.history[:]
+        return pos
+
+    def update_hash(self):
+        """
+        Recompute the Zobrist hash from scratch.
+
+        Pieces placed or removed keep the hash current on their own, but
+        turn, castling rights and the en passant square set directly (as
+        when setting up a position) need this call afterwards.
+
+        """
+        self.hash = compute_hash(self)
+
+    @property
+    def occupancy(self):
+        """
+        Bitboard of every occupied square.
+
+        """
+        return self.occupied[WHITE] | self.occupied[BLACK]
+
+    def put_piece(self, sq, color, piece_type):
+        """
+        Place a piece on an empty square.
+
+        Editing the pieces directly does not refresh checkers; call
+        update_checkers() once the setup is complete.
+
+        Parameters:
+        - sq (int): Target square.
+        - color (int): Piece colour.
+        - piece_type (int): Piece type.
+
+        """
+        b = 1 << sq
+        self.pieces[color][piece_type] |= b
+        self.occupied[color] |= b
+        self.board[sq] = (color, piece_type)
+        self.hash ^= PIECE_KEYS[color][piece_type][sq]
+
+    def remove_piece(self, sq):
+        """
+        Remove the piece on a square.
+
+        Parameters:
+        - sq (int): Square to clear.
+
+        Returns:
+        - tuple: The removed (color, piece_type), or None if the square was empty.
+
+        """
+        piece = self.board[sq]
+        if piece is not None:
+            color, piece_type = piece
+            b = ~(1 << sq)
+            self.pieces[color][piece_type] &= b
+            self.occupied[color] &= b
+            self.board[sq] = None
+            self.hash ^= PIECE_KEYS[color][piece_type][sq]
+        return piece
+
+    def piece_at(self, sq):
+        """
+        Return the (color, piece_type) on a square, or None if it is empty.
+
+        """
+        return self.board[sq]
+
+    def king_square(self, color):
+        """
+        Return the square of a king, or None if that king is not on the board.
+
+        """
+        kings = self.pieces[color][KING]
+        return lsb(kings) if kings else None
+
+    def attacks_from(self, sq, occupancy=None):
+        """
+        Return the squares attacked by the piece on a square.
+
+        Parameters:
+        - sq (int): Square of the attacking piece.
+        - occupancy (int): Blockers to use instead of the current occupancy.
+
+        Returns:
+        - int: Bitboard of attacked squares (0 for an empty square).
+
+        """
+        piece = self.board[sq]
+        if piece is None:
+            return 0
+        color, piece_type = piece
+        if occupancy is None:
+            occupancy = self.occupancy
+        if piece_type == PAWN:
+            return PAWN_ATTACKS[color][sq]
+        if piece_type == KNIGHT:
+            return KNIGHT_ATTACKS[sq]
+        if piece_type == KING:
+            return KING_ATTACKS[sq]
+        if piece_type == BISHOP:
+            return bishop_attacks(sq, occupancy)
+        if piece_type == ROOK:
+            return rook_attacks(sq, occupancy)
+        return queen_attacks(sq, occupancy)
+
+    def attackers(self, sq, color, occupancy=None):
+        """
+        Return the pieces of a colour that attack a square.
+
+        Parameters:
+        - sq (int): Attacked square.
+        - color (int): Colour of the attackers.
+        - occupancy (int): Blockers to use instead of the current occupancy.
+
+        Returns:
+        - int: Bitboard of attacking pieces.
+
+        """
+        if occupancy is None:
+            occupancy = self.occupancy
+        p = self.pieces[color]
+        attackers = KNIGHT_ATTACKS[sq] & p[KNIGHT]
+        attackers |= KING_ATTACKS[sq] & p[KING]
+        attackers |= PAWN_ATTACKS[color ^ 1][sq] & p[PAWN]
+        attackers |= rook_attacks(sq, occupancy) & (p[ROOK] | p[QUEEN])
+        attackers |= bishop_attacks(sq, occupancy) & (p[BISHOP] | p[QUEEN])
+        return attackers
+
+    def is_attacked(self, sq, color):
+        """
+        Check if any piece of a colour attacks a square.
+
+        """
+        return self.attackers(sq, color) != 0
+
+    def in_check(self, color=None):
+        """
+        Check if a king is in check.
+
+        The side to move is answered from the incrementally kept checkers;
+        the other king is probed through the attack tables.
+
+        Parameters:
+        - color (int): Colour of the king, the side to move by default.
+
+        Returns:
+        - bool: True if the king is attacked.
+
+        """
+        if color is None or color == self.turn:
+            return self.checkers != 0
+        king = self.king_square(color)
+        return king is not None and self.is_attacked(king, color ^ 1)
+
+    def update_checkers(self):
+        """
+        Recompute the pieces giving check to the side to move from scratch.
+
+        """
+        king = self.king_square(self.turn)
+        self.checkers = 0 if king is None else self.attackers(king, self.turn ^ 1)
+
+    def legal_moves(self, from_sq=None):
+        """
+        Generate the legal moves of the side to move.
+
+        Pins and checks are worked out once up front: a pinned piece may only
+        move along its pin ray, and while in check the other pieces may only
+        capture the checker or block its line. The king never steps onto an
+        attacked square. Only en passant, which removes two pieces from a
+        line at once, is verified by recomputing the attacks on the king.
+
+        Parameters:
+        - from_sq (int): Only generate moves of the piece on this square.
+
+        Returns:
+        - list: Encoded legal moves.
+
+        """
+        us = self.turn
+        them = us ^ 1
+        own = self.occupied[us]
+        enemy = self.occupied[them]
+        occupancy = own | enemy
+        mask = FULL if from_sq is None else 1 << from_sq
+        mine = self.pieces[us]
+        theirs = self.pieces[them]
+        moves = []
+
+        king = self.king_square(us)
+        if king is None:
+            check_mask = FULL
+            pins = {}
+        else:
+            check_mask = self._check_mask(king)
+            pins = self._pins(king)
+            if mine[KING] & mask:
+                without_king = occupancy ^ (1 << king)
+                for to_sq in iter_bits(KING_ATTACKS[king] & ~own):
+                    if not self.attackers(to_sq, them, without_king):
+                        moves.append(encode_move(king, to_sq))
+                if self.castling and not self.checkers:
+                    self._castling_moves(moves, occupancy)
+
+        if not check_mask:
+            return moves
+
+        forward = 8 if us == WHITE else -8
+        start_rank = 1 if us == WHITE else 6
+        last_rank = 7 if us == WHITE else 0
+        pawn_attacks = PAWN_ATTACKS[us]
+        for sq in iter_bits(mine[PAWN] & mask):
+            allowed = check_mask & pins.get(sq, FULL)
+            to_sq = sq + forward
+            destinations = pawn_attacks[sq] & enemy
+            if not occupancy >> to_sq & 1:
+                destinations |= 1 << to_sq
+                if square_rank(sq) == start_rank and not occupancy >> (to_sq + forward) & 1:
+                    destinations |= 1 << (to_sq + forward)
+            for to_sq in iter_bits(destinations & allowed):
+                if square_rank(to_sq) == last_rank:
+                    for piece_type in PROMOTIONS:
+                        moves.append(encode_move(sq, to_sq, piece_type))
+                else:
+                    moves.append(encode_move(sq, to_sq))
+            if self.ep_square is not None and pawn_attacks[sq] >> self.ep_square & 1:
+                if king is None or self._ep_is_safe(sq, king):
+                    moves.append(encode_move(sq, self.ep_square))
+
+        for piece_type in (KNIGHT, BISHOP, ROOK, QUEEN):
+            for sq in iter_bits(mine[piece_type] & mask):
+                allowed = check_mask & pins.get(sq, FULL) & ~own
+                for to_sq in iter_bits(self.attacks_from(sq, occupancy) & allowed):
+                    moves.append(encode_move(sq, to_sq))
+        return moves
+
+    def _check_mask(self, king):
+        """
+        Return the squares a non-king move must land on to deal with check.
+
+        Returns:
+        - int: All squares when not in check, the checker and the squares
+          between it and the king for a single check, nothing for a double check.
+
+        """
+        checkers = self.checkers
+        if not checkers:
+            return FULL
+        if checkers & (checkers - 1):
+            return 0
+        return checkers | BETWEEN[king][lsb(checkers)]
+
+    def _pins(self, king):
+        """
+        Find the side to move's pieces pinned to its king.
+
+        Returns:
+        - dict: Pinned square mapped to the squares it may still move to
+          (the pin ray up to and including the pinning piece).
+
+        """
+        us = self.turn
+        theirs = self.pieces[us ^ 1]
+        occupancy = self.occupancy
+        snipers = ROOK_RAYS[king] & (theirs[ROOK] | theirs[QUEEN])
+        snipers |= BISHOP_RAYS[king] & (theirs[BISHOP] | theirs[QUEEN])
+        pins = {}
+        for sniper in iter_bits(snipers):
+            blockers = BETWEEN[king][sniper] & occupancy
+            if blockers and not blockers & (blockers - 1) and blockers & self.occupied[us]:
+                pins[lsb(blockers)] = BETWEEN[king][sniper] | 1 << sniper
+        return pins
+
+    def _ep_is_safe(self, from_sq, king):
+        """
+        Check that an en passant capture from a square leaves the king safe.
+
+        """
+        us = self.turn
+        theirs = self.pieces[us ^ 1]
+        to_sq = self.ep_square
+        captured = to_sq - 8 if us == WHITE else to_sq + 8
+        occupancy = self.occupancy ^ (1 << from_sq) ^ (1 << captured) | (1 << to_sq)
+        return not (
+            rook_attacks(king, occupancy) & (theirs[ROOK] | theirs[QUEEN])
+            or bishop_attacks(king, occupancy) & (theirs[BISHOP] | theirs[QUEEN])
+            or KNIGHT_ATTACKS[king] & theirs[KNIGHT]
+            or PAWN_ATTACKS[us][king] & theirs[PAWN] & ~(1 << captured)
+        )
+
+    def _castling_moves(self, moves, occupancy):
+        """
+        Append the castling moves of the side to move.
+
+        The king must not be in check (tested by the caller) nor cross or
+        land on an attacked square, and the squares between king and rook
+        must be empty.
+
+        """
+        us = self.turn
+        them = us ^ 1
+        for color, right, king_from, king_to, rook_from, _, empty, path in CASTLING_MOVES:
+            if color != us or not self.castling & right or occupancy & empty:
+                continue
+            if self.board[king_from] != (us, KING) or self.board[rook_from] != (us, ROOK):
+                continue
+            if not any(self.is_attacked(sq, them) for sq in path[1:]):
+                moves.append(encode_move(king_from, king_to))
+
+    def find_move(self, from_sq, to_sq, promotion=0):
+        """
+        Find the legal move between two squares.
+
+        Parameters:
+        - from_sq (int): Origin square.
+        - to_sq (int): Target square.
+        - promotion (int): Promotion piece type; any promotion matches when 0.
+
+        Returns:
+        - int: The encoded move, or None if no such legal move exists.
+
+        """
+        for move in self.legal_moves(from_sq):
+            if move_to(move) == to_sq and (not promotion or move_promotion(move) == promotion):
+                return move
+        return None
+
+    def captured_square(self, move):
+        """
+        Return the square of the piece a move captures.
+
+        Parameters:
+        - move (int): Encoded move that has not been played yet.
+
+        Returns:
+        - int: Square of the captured piece, or None for a quiet move.
+
+        """
+        to_sq = move_to(move)
+        piece = self.board[move_from(move)]
+        if piece is not None and piece[1] == PAWN and to_sq == self.ep_square:
+            return to_sq - 8 if piece[0] == WHITE else to_sq + 8
+        return to_sq if self.board[to_sq] is not None else None
+
+    def castling_rook(self, move):
+        """
+        Return the (from, to) squares of the rook moved by a castling move.
+
+        Parameters:
+        - move (int): Encoded move that has not been played yet.
+
+        Returns:
+        - tuple: Rook squares, or None if the move is not castling.
+
+        """
+        from_sq = move_from(move)
+        piece = self.board[from_sq]
+        if piece is not None and piece[1] == KING and abs(move_to(move) - from_sq) == 2:
+            return CASTLING_ROOKS[move_to(move)]
+        return None
+
+    def repetitions(self):
+        """
+        Count the earlier occurrences of the position in the history.
+
+        Only positions since the last capture or pawn move can repeat, and
+        only every second one has the same side to move, so at most
+        halfmove_clock / 2 hashes are compared.
+
+        Returns:
+        - int: 0 for a new position, 2 or more for a threefold repetition.
+
+        """
+        history = self.history
+        count = 0
+        for index in range(len(history) - 4, max(-1, len(history) - 1 - self.halfmove_clock), -2):
+            if history[index] == self.hash:
+                count += 1
+        return count
+
+    def make_move(self, move):
+        """
+        Play a move, updating pieces, castling and en passant state and the side to move.
+
+        The hash is updated incrementally: each piece placed or removed
+        flips its own key, and the castling, en passant and turn keys are
+        swapped for their new values.
+
+        Parameters:
+        - move (int): Encoded pseudo-legal move.
+
+        Returns:
+        - tuple: Undo record (move, captured piece or None, castling rights,
+          en passant square, halfmove clock, checkers, hash) from before the
+          move, which unmake_move() takes to restore the position.
+
+        """
+        from_sq = move_from(move)
+        to_sq = move_to(move)
+        us = self.turn
+        piece_type = self.board[from_sq][1]
+        undo = (move, self.board[to_sq], self.castling, self.ep_square, self.halfmove_clock, self.checkers, self.hash)
+        self.history.append(self.hash)
+        self.hash ^= CASTLING_KEYS[self.castling] ^ ep_key(self)
+
+        self.halfmove_clock += 1
+        if self.remove_piece(to_sq) is not None:
+            self.halfmove_clock = 0
+        self.remove_piece(from_sq)
+
+        moved = [to_sq]
+        vacated = [from_sq]
+        ep_square = self.ep_square
+        self.ep_square = None
+        if piece_type == PAWN:
+            self.halfmove_clock = 0
+            if to_sq == ep_square:
+                captured_sq = to_sq - 8 if us == WHITE else to_sq + 8
+                undo = (move, self.remove_piece(captured_sq)) + undo[2:]
+                vacated.append(captured_sq)
+            elif abs(to_sq - from_sq) == 16:
+                self.ep_square = (from_sq + to_sq) // 2
+            if move_promotion(move):
+                piece_type = move_promotion(move)
+        elif piece_type == KING and abs(to_sq - from_sq) == 2:
+            rook_from, rook_to = CASTLING_ROOKS[to_sq]
+            self.remove_piece(rook_from)
+            self.put_piece(rook_to, us, ROOK)
+            vacated.append(rook_from)
+            moved.append(rook_to)
+
+        self.put_piece(to_sq, us, piece_type)
+        self.castling &= CASTLING_MASK[from_sq] & CASTLING_MASK[to_sq]
+        if us == BLACK:
+            self.fullmove_number += 1
+        self.turn = us ^ 1
+        self.hash ^= CASTLING_KEYS[self.castling] ^ ep_key(self) ^ TURN_KEY
+        self._update_checkers_after(moved, vacated)
+        return undo
+
+    def unmake_move(self, undo):
+        """
+        Take back the last move played, in constant time.
+
+        The pieces it moved are put back and everything else (castling
+        rights, en passant square, clocks, checkers and hash) is restored
+        from the record, so nothing is recomputed.
+
+        Parameters:
+        - undo (tuple): Record returned by make_move() for the last move.
+
+        """
+        move, captured, castling, ep_square, halfmove_clock, checkers, key = undo
+        from_sq = move_from(move)
+        to_sq = move_to(move)
+        us = self.turn ^ 1
+        piece_type = PAWN if move_promotion(move) else self.board[to_sq][1]
+
+        self.remove_piece(to_sq)
+        self.put_piece(from_sq, us, piece_type)
+        if captured is not None:
+            if piece_type == PAWN and to_sq == ep_square:
+                self.put_piece(to_sq - 8 if us == WHITE else to_sq + 8, *captured)
+            else:
+                self.put_piece(to_sq, *captured)
+        elif piece_type == KING and abs(to_sq - from_sq) == 2:
+            rook_from, rook_to = CASTLING_ROOKS[to_sq]
+            self.remove_piece(rook_to)
+            self.put_piece(rook_from, us, ROOK)
+
+        if us == BLACK:
+            self.fullmove_number -= 1
+        self.turn = us
+        self.castling = castling
+        self.ep_square = ep_square
+        self.halfmove_clock = halfmove_clock
+        self.checkers = checkers
+        self.hash = key
+        self.history.pop()
+
+    def _update_checkers_after(self, moved, vacated):
+        """
+        Find the checks given by the last move.
+
+        Only a piece that arrived on a square can give a direct check, and
+        only a slider on a line through a vacated square can be discovered,
+        so the rest of the board is never looked at.
+
+        Parameters:
+        - moved (list): Squares the mover's pieces arrived on.
+        - vacated (list): Squares that were emptied by the move.
+
+        """
+        king = self.king_square(self.turn)
+        if king is None:
+            self.checkers = 0
+            return
+        them = self.turn ^ 1
+        king_bit = 1 << king
+        occupancy = self.occupancy
+        checkers = 0
+        for sq in moved:
+            if self.attacks_from(sq, occupancy) & king_bit:
+                checkers |= 1 << sq
+        p = self.pieces[them]
+        for sq in vacated:
+            if ROOK_RAYS[king] >> sq & 1:
+                checkers |= rook_attacks(king, occupancy) & (p[ROOK] | p[QUEEN])
+            elif BISHOP_RAYS[king] >> sq & 1:
+                checkers |= bishop_attacks(king, occupancy) & (p[BISHOP] | p[QUEEN])
+        self.checkers = checkers
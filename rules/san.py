@@ -0,0 +1,235 @@
+"""
+Algebraic notation for Position moves: SAN, long algebraic (LAN) and the
+Polish piece letters.
+
+Parsing looks only at the pieces that could have made the move: the
+candidates are found from the attack tables of the target square, and only
+their moves are generated, so a move is resolved in time proportional to
+the legal moves of those pieces, whatever else is on the board.
+
+Functions:
+- parse_notation(pos, text): Find the legal move written in SAN or LAN, English or Polish.
+- parse_san(pos, text): Find the legal move written in SAN.
+- parse_lan(pos, text): Find the legal move written in LAN, e.g. 'e2e4' or 'Ng1-f3'.
+- move_to_san(pos, move): Write a legal move in SAN.
+
+"""
+
+import re
+
+from rules.bitboard import (
+    WHITE, PAWN, KNIGHT, BISHOP, ROOK, KING,
+    square_file, square_rank, square_name, parse_square, iter_bits, move_from, move_to, move_promotion,
+)
+from rules.attacks import KNIGHT_ATTACKS, KING_ATTACKS
+from rules.magic import rook_attacks, bishop_attacks, queen_attacks
+
+PIECE_LETTERS = 'PNBRQK'
+
+# Polish piece letters (hetman, wieza, goniec, skoczek) mapped to English; K is the same
+POLISH_LETTERS = str.maketrans('HWGS', 'QRBN')
+
+SAN_PATTERN = re.compile(r'^([NBRQK])?([a-h])?([1-8])?(x)?([a-h][1-8])(?:=?([NBRQ]))?$')
+LAN_PATTERN = re.compile(r'^([NBRQK])?([a-h][1-8])[-x]?([a-h][1-8])(?:=?([NBRQnbrq]))?$')
+
+
+def _castling_move(pos, long):
+    """
+    Return the legal castling move of the side to move, or None.
+
+    """
+    king = 4 if pos.turn == WHITE else 60
+    return pos.find_move(king, king - 2 if long else king + 2) if pos.board[king] == (pos.turn, KING) else None
+
+
+def _reaching(pos, piece_type, to_sq):
+    """
+    Return the side to move's pieces of a type that could move to a square.
+
+    """
+    us = pos.turn
+    pieces = pos.pieces[us][piece_type]
+    occupancy = pos.occupancy
+    if piece_type == PAWN:
+        forward = 8 if us == WHITE else -8
+        from_sq = to_sq - forward
+        bb = 0
+        if pos.board[to_sq] is None and to_sq != pos.ep_square:
+            if 0 <= from_sq < 64 and pieces >> from_sq & 1:
+                bb = 1 << from_sq
+            elif 0 <= from_sq - forward < 64 and pos.board[from_sq] is None and pieces >> (from_sq - forward) & 1:
+                bb = 1 << (from_sq - forward)
+        else:
+            for df in (-1, 1):
+                if 0 <= square_file(to_sq) + df < 8 and 0 <= from_sq + df < 64:
+                    bb |= pieces & 1 << (from_sq + df)
+        return bb
+    if piece_type == KNIGHT:
+        return pieces & KNIGHT_ATTACKS[to_sq]
+    if piece_type == KING:
+        return pieces & KING_ATTACKS[to_sq]
+    if piece_type == BISHOP:
+        return pieces & bishop_attacks(to_sq, occupancy)
+    if piece_type == ROOK:
+        return pieces & rook_attacks(to_sq, occupancy)
+    return pieces & queen_attacks(to_sq, occupancy)
+
+
+def parse_notation(pos, text):
+    """
+    Find the legal move written in SAN or LAN, with English or Polish piece letters.
+
+    Accepts e.g. 'Nf3', 'Sf3', 'exd8=Q+', 'exd8=H', 'O-O', 'e2e4', 'Ng1-f3' and 'e7e8q'.
+
+    Parameters:
+    - pos (Position): Position the move is played in.
+    - text (str): The move.
+
+    Returns:
+    - int: The encoded move.
+
+    Raises:
+    - ValueError: If the text is not a move, is illegal or is ambiguous.
+
+    """
+    notation = text.strip().translate(POLISH_LETTERS)
+    try:
+        if LAN_PATTERN.match(notation.rstrip('+#!?')):
+            return parse_lan(pos, notation)
+        return parse_san(pos, notation)
+    except ValueError as error:
+        raise ValueError(str(error).split(':')[0] + ': %r' % text) from None
+
+
+def parse_lan(pos, text):
+    """
+    Find the legal move written in long algebraic notation.
+
+    Both squares are given, with an optional piece letter, '-' or 'x'
+    between them and a promotion letter, e.g. 'e2e4', 'Ng1-f3', 'e7e8q'
+    or 'e7xd8=Q'; UCI moves are LAN too.
+
+    Parameters:
+    - pos (Position): Position the move is played in.
+    - text (str): The move.
+
+    Returns:
+    - int: The encoded move.
+
+    Raises:
+    - ValueError: If the text is not a move or is illegal.
+
+    """
+    match = LAN_PATTERN.match(text.rstrip('+#!?'))
+    if match is None:
+        raise ValueError("Invalid move: %r" % text)
+    letter, origin, target, promotion = match.groups()
+    from_sq = parse_square(origin)
+    promotion = PIECE_LETTERS.index(promotion.upper()) if promotion else 0
+    piece = pos.board[from_sq]
+    move = pos.find_move(from_sq, parse_square(target), promotion)
+    if (move is None or move_promotion(move) != promotion
+            or letter and piece[1] != PIECE_LETTERS.index(letter)):
+        raise ValueError("Illegal move: %r" % text)
+    return move
+
+
+def parse_san(pos, text):
+    """
+    Find the legal move written in SAN, e.g. 'e4', 'Nbd7', 'exd8=Q+' or 'O-O'.
+
+    Check, mate and annotation suffixes are accepted and ignored; castling
+    may also be written with zeros. A pawn push must go to an empty square
+    and a pawn capture must name the file the pawn comes from.
+
+    Parameters:
+    - pos (Position): Position the move is played in.
+    - text (str): The move.
+
+    Returns:
+    - int: The encoded move.
+
+    Raises:
+    - ValueError: If the text is not a move, is illegal or is ambiguous.
+
+    """
+    san = text.rstrip('+#!?')
+    if san in ('O-O', '0-0', 'O-O-O', '0-0-0'):
+        move = _castling_move(pos, len(san) == 5)
+        if move is None:
+            raise ValueError("Illegal move: %r" % text)
+        return move
+
+    match = SAN_PATTERN.match(san)
+    if match is None:
+        raise ValueError("Invalid move: %r" % text)
+    letter, from_file, from_rank, capture, target, promotion = match.groups()
+    piece_type = PIECE_LETTERS.index(letter) if letter else PAWN
+    if piece_type == PAWN:
+        capture = bool(capture or from_file)
+        if capture != (from_file is not None and from_file != target[0]):
+            raise ValueError("Invalid move: %r" % text)
+    to_sq = parse_square(target)
+    promotion = PIECE_LETTERS.index(promotion) if promotion else 0
+
+    found = None
+    for from_sq in iter_bits(_reaching(pos, piece_type, to_sq)):
+        if from_file and square_file(from_sq) != ord(from_file) - ord('a'):
+            continue
+        if from_rank and square_rank(from_sq) != int(from_rank) - 1:
+            continue
+        move = pos.find_move(from_sq, to_sq, promotion)
+        if move is None or move_promotion(move) != promotion:
+            continue
+        if piece_type == PAWN and (pos.captured_square(move) is not None) != capture:
+            continue
+        if found is not None:
+            raise ValueError("Ambiguous move: %r" % text)
+        found = move
+    if found is None:
+        raise ValueError("Illegal move: %r" % text)
+    return found
+
+
+def move_to_san(pos, move):
+    """
+    Write a legal move in SAN, with a check or mate suffix.
+
+    Parameters:
+    - pos (Position): Position the move is played in; it is left as it was.
+    - move (int): Encoded legal move.
+
+    Returns:
+    - str: The move in SAN.
+
+    """
+    from_sq = move_from(move)
+    to_sq = move_to(move)
+    piece_type = pos.board[from_sq][1]
+
+    if pos.castling_rook(move) is not None:
+        san = 'O-O' if to_sq > from_sq else 'O-O-O'
+    else:
+        capture = pos.captured_square(move) is not None
+        if piece_type == PAWN:
+            san = ('abcdefgh'[square_file(from_sq)] + 'x' if capture else '') + square_name(to_sq)
+            if move_promotion(move):
+                san += '=' + PIECE_LETTERS[move_promotion(move)]
+        else:
+            san = PIECE_LETTERS[piece_type]
+            others = [sq for sq in iter_bits(_reaching(pos, piece_type, to_sq) & ~(1 << from_sq))
+                      if pos.find_move(sq, to_sq) is not None]
+            if others:
+                if all(square_file(sq) != square_file(from_sq) for sq in others):
+                    san += 'abcdefgh'[square_file(from_sq)]
+                elif all(square_rank(sq) != square_rank(from_sq) for sq in others):
+                    san += str(square_rank(from_sq) + 1)
+                else:
+                    san += square_name(from_sq)
+            san += ('x' if capture else '') + square_name(to_sq)
+
+    undo = pos.make_move(move)
+    if pos.checkers:
+        san += '#' if not pos.legal_moves() else '+'
+    pos.unmake_move(undo)
+    return san
@@ -0,0 +1,69 @@
+"""
+Zobrist keys for hashing positions.
+
+A position's hash is the XOR of one 64-bit key per (colour, piece type,
+square) occupied, one per castling-rights combination, one per en passant
+file and one for black to move. The en passant file only counts when a pawn
+can actually capture there, so positions that differ in nothing else hash
+alike, as the repetition rule requires. Every change of the position flips only the
+keys it touches, so Position keeps its hash up to date in constant time per
+move. The keys come from a fixed seed, so hashes agree between processes.
+
+- PIECE_KEYS[color][piece_type][sq]: Key of a piece on a square.
+- CASTLING_KEYS[rights]: Key of a castling-rights mask (0..15).
+- EP_KEYS[file]: Key of an en passant file.
+- TURN_KEY: Key XORed in when black is to move.
+
+Functions:
+- ep_key(pos): Return the en passant key that applies to a position.
+- compute_hash(pos): Compute the hash of a position from scratch.
+
+"""
+
+import random
+from rules.bitboard import PAWN
+from rules.attacks import PAWN_ATTACKS
+
+_rng = random.Random(0x5A0B1F7)
+
+PIECE_KEYS = [[[_rng.getrandbits(64) for _ in range(64)] for _ in range(6)] for _ in range(2)]
+CASTLING_KEYS = [0] + [_rng.getrandbits(64) for _ in range(15)]
+EP_KEYS = [_rng.getrandbits(64) for _ in range(8)]
+TURN_KEY = _rng.getrandbits(64)
+
+
+def ep_key(pos):
+    """
+    Return the en passant key of a position.
+
+    Returns:
+    - int: EP_KEYS of the en passant file if a pawn of the side to move
+      attacks the en passant square, else 0.
+
+    """
+    ep = pos.ep_square
+    if ep is not None and PAWN_ATTACKS[pos.turn ^ 1][ep] & pos.pieces[pos.turn][PAWN]:
+        return EP_KEYS[ep & 7]
+    return 0
+
+
+def compute_hash(pos):
+    """
+    Compute the hash of a position from scratch.
+
+    Parameters:
+    - pos (Position): Position to hash.
+
+    Returns:
+    - int: 64-bit Zobrist hash.
+
+    """
+    h = 0
+    for sq, piece in enumerate(pos.board):
+        if piece is not None:
+            h ^= PIECE_KEYS[piece[0]][piece[1]][sq]
+    h ^= CASTLING_KEYS[pos.castling]
+    h ^= ep_key(pos)
+    if pos.turn:
+        h ^= TURN_KEY
+    return h
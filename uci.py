@@ -0,0 +1,245 @@
+import sys
+import threading
+from rules.bitboard import WHITE, move_uci
+from rules.fen import STARTING_FEN, parse_fen
+from rules.san import parse_lan
+from engine.evaluate import MAX_PLY
+from engine.search import DEFAULT_MOVES_TO_GO, Search, allot_time, format_score
+from engine.smp import ParallelSearch
+from engine.tt import TranspositionTable
+
+ENGINE_NAME = 'Chess'
+ENGINE_AUTHOR = 'Chess contributors'
+
+
+class UciEngine:
+    """
+    UciEngine class speaks the UCI protocol over text streams.
+
+    The search runs in a background thread so 'stop' and 'isready' are
+    answered while it thinks.
+
+    Attributes:
+    - position (Position): Position set by the last 'position' command.
+    - hash_mb (float): Transposition table size in megabytes (option Hash).
+    - threads (int): Number of search processes (option Threads).
+    - search (Search): Search object, ParallelSearch when threads > 1.
+    - out: Stream the replies are written to.
+
+    Methods:
+    - run(stream): Read and answer commands until 'quit' or end of input.
+    - handle(line): Answer one command.
+    - set_position(args): Handle the 'position' command.
+    - go(args): Handle the 'go' command.
+    - stop(): Stop the running search and wait for its bestmove.
+    - new_search(): Create the search object for the current options.
+    - send(text): Write one line to the GUI.
+
+    """
+
+    def __init__(self, out=sys.stdout):
+        """
+        Initialize the engine at the starting position.
+
+        """
+        self.position = parse_fen(STARTING_FEN)
+        self.hash_mb = 16
+        self.threads = 1
+        self.search = None
+        self.out = out
+        self._thread = None
+        self._stop = threading.Event()
+        self._released = threading.Event()
+
+    def send(self, text):
+        """
+        Write one line to the GUI.
+
+        """
+        self.out.write(text + '\n')
+        self.out.flush()
+
+    def new_search(self):
+        """
+        Create the search object for the current Hash and Threads options.
+
+        """
+        self.stop()
+        if isinstance(self.search, ParallelSearch):
+            self.search.close()
+        if self.threads > 1:
+            self.search = ParallelSearch(self.threads, self.hash_mb, self._stop)
+        else:
+            self.search = Search(TranspositionTable(self.hash_mb), self._stop)
+
+    def run(self, stream=sys.stdin):
+        """
+        Read and answer commands until 'quit' or the end of the input.
+
+        """
+        try:
+            for line in stream:
+                if not self.handle(line):
+                    break
+        finally:
+            self.stop()
+            if isinstance(self.search, ParallelSearch):
+                self.search.close()
+
+    def handle(self, line):
+        """
+        Answer one command; unknown commands are ignored, as UCI requires.
+
+        Returns:
+        - bool: False once the GUI asked to quit.
+
+        """
+        tokens = line.split()
+        if not tokens:
+            return True
+        command, args = tokens[0], tokens[1:]
+        if command == 'uci':
+            self.send('id name %s' % ENGINE_NAME)
+            self.send('id author %s' % ENGINE_AUTHOR)
+            self.send('option name Hash type spin default 16 min 1 max 4096')
+            self.send('option name Threads type spin default 1 min 1 max 256')
+            self.send('uciok')
+        elif command == 'isready':
+            if self.search is None:
+                self.new_search()
+            self.send('readyok')
+        elif command == 'setoption':
+            self.set_option(args)
+        elif command == 'ucinewgame':
+            self.new_search()
+        elif command == 'position':
+            self.set_position(args)
+        elif command == 'go':
+            self.go(args)
+        elif command == 'stop':
+            self.stop()
+        elif command == 'quit':
+            return False
+        return True
+
+    def set_option(self, args):
+        """
+        Handle 'setoption name <name> value <value>' for Hash and Threads.
+
+        """
+        if 'name' not in args or 'value' not in args:
+            return
+        name = ' '.join(args[args.index('name') + 1:args.index('value')]).lower()
+        value = ' '.join(args[args.index('value') + 1:])
+        try:
+            if name == 'hash':
+                self.hash_mb = max(1, int(value))
+            elif name == 'threads':
+                self.threads = max(1, int(value))
+            else:
+                return
+        except ValueError:
+            return
+        self.new_search()
+
+    def set_position(self, args):
+        """
+        Handle 'position [startpos | fen <fen>] [moves <move> ...]'.
+
+        An invalid position or move is reported and the rest of the command ignored.
+
+        """
+        moves = args.index('moves') if 'moves' in args else len(args)
+        try:
+            if args and args[0] == 'fen':
+                position = parse_fen(' '.join(args[1:moves]))
+            else:
+                position = parse_fen(STARTING_FEN)
+            for text in args[moves + 1:]:
+                position.make_move(parse_lan(position, text))
+        except ValueError as error:
+            self.send('info string %s' % error)
+            return
+        self.position = position
+
+    def go(self, args):
+        """
+        Handle 'go' with depth, movetime, wtime/btime/winc/binc/movestogo or infinite.
+
+        A value that is not a number is reported and the command ignored.
+
+        """
+        options = {}
+        try:
+            for index, token in enumerate(args):
+                if token in ('depth', 'movetime', 'wtime', 'btime', 'winc', 'binc', 'movestogo') and index + 1 < len(args):
+                    options[token] = int(args[index + 1])
+        except ValueError:
+            self.send('info string Invalid %s value: %r' % (token, args[index + 1]))
+            return
+        self.stop()
+        if self.search is None:
+            self.new_search()
+        infinite = 'infinite' in args
+        max_depth = options.get('depth', MAX_PLY)
+        time_limit = None
+        if 'movetime' in options:
+            time_limit = options['movetime'] / 1000
+        elif not infinite:
+            side = 'w' if self.position.turn == WHITE else 'b'
+            if side + 'time' in options:
+                time_limit = allot_time(options[side + 'time'] / 1000, options.get(side + 'inc', 0) / 1000,
+                                        options.get('movestogo', DEFAULT_MOVES_TO_GO))
+
+        self._stop.clear()
+        self._released.clear()
+        if not infinite:
+            self._released.set()
+        position = self.position.copy()
+        self._thread = threading.Thread(target=self._search, args=(position, time_limit, max_depth), daemon=True)
+        self._thread.start()
+
+    def _search(self, position, time_limit, max_depth):
+        """
+        Search in the background thread and report the best move.
+
+        In infinite mode the best move is held back until 'stop'.
+
+        """
+        move = self.search.search(position, time_limit, max_depth, self._info)
+        self._released.wait()
+        self.send('bestmove %s' % (move_uci(move) if move is not None else '0000'))
+
+    def _info(self, search):
+        """
+        Report a completed iteration.
+
+        """
+        self.send('info depth %d score %s nodes %d nps %d time %d hashfull %d pv %s' % (
+            search.depth, format_score(search.score), search.nodes, search.nps(), search.elapsed * 1000,
+            search.tt.usage(), ' '.join(move_uci(move) for move in search.pv)))
+
+    def stop(self):
+        """
+        Stop the running search, if any, and wait for its bestmove.
+
+        """
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._released.set()
+        self._thread.join()
+        self._thread = None
+
+
+def main():
+    """
+    Command-line entry point: speak UCI on standard input and output.
+
+    """
+    UciEngine().run()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())